@@ -4,15 +4,30 @@ Chess Lamp
 Monitors Lichess games and controls Govee lamp based on whose turn it is.
 """
 
+import atexit
+import copy
+import importlib
+import importlib.util
 import json
+import logging
+import logging.handlers
+import operator
 import os
+import queue
+import random
 import sys
 import time
 import asyncio
 import threading
-from typing import Optional, Dict, Any, Union
+import concurrent.futures
+import functools
+from typing import Optional, Dict, Any, NamedTuple, Union
 import berserk
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+log = logging.getLogger('chess_lamp')
 
 # Flask for API server (optional, only if flask is available)
 try:
@@ -31,21 +46,61 @@ except ImportError:
     GoveeLANController = None
     LAN_CONTROL_AVAILABLE = False
 
-# Try to import Govee library - support multiple implementations
+# Use orjson for JSON encoding/decoding when available (much faster than stdlib json)
 try:
-    from govee_api_laggat import Govee
-    GOVEE_LIB = 'laggat'
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Try to import Govee library - support multiple implementations
+# (module name, library tag) in order of preference; probing with find_spec
+# avoids raising an ImportError for every library that isn't installed
+GOVEE_LIBRARIES = [
+    ('govee_api_laggat', 'laggat'),
+    ('govee_api', 'standard'),
+    ('aiogovee', 'async'),
+]
+Govee = None
+GOVEE_LIB = None
+for _module_name, _lib_tag in GOVEE_LIBRARIES:
+    if importlib.util.find_spec(_module_name) is None:
+        continue
     try:
-        from govee_api import Govee
-        GOVEE_LIB = 'standard'
-    except ImportError:
-        try:
-            from aiogovee import Govee
-            GOVEE_LIB = 'async'
-        except ImportError:
-            Govee = None
-            GOVEE_LIB = None
+        Govee = importlib.import_module(_module_name).Govee
+        GOVEE_LIB = _lib_tag
+        break
+    except (ImportError, AttributeError):
+        continue
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """Encode an object as compact JSON bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON from bytes or str (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def sleep_until(deadline: float):
+    """
+    Sleep until a time.monotonic() deadline.
+    Lets lamp effects count the command's own round-trip toward their timing
+    instead of sleeping the full duration after it.
+    
+    Args:
+        deadline: time.monotonic() value to wait for (returns at once if past)
+    """
+    remaining = deadline - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
 
 
 def hex_to_rgb(hex_color: str) -> Dict[str, int]:
@@ -61,11 +116,9 @@ def hex_to_rgb(hex_color: str) -> Dict[str, int]:
     hex_color = hex_color.lstrip('#')
     if len(hex_color) != 6:
         raise ValueError(f"Invalid hex color: {hex_color}")
-    return {
-        'r': int(hex_color[0:2], 16),
-        'g': int(hex_color[2:4], 16),
-        'b': int(hex_color[4:6], 16)
-    }
+    # One C-level parse of all three bytes (raises ValueError on non-hex input)
+    r, g, b = bytes.fromhex(hex_color)
+    return {'r': r, 'g': g, 'b': b}
 
 
 def rgb_to_hex(rgb: Union[Dict[str, int], tuple]) -> str:
@@ -79,12 +132,14 @@ def rgb_to_hex(rgb: Union[Dict[str, int], tuple]) -> str:
         Hex color string (e.g., "#00FF00")
     """
     if isinstance(rgb, dict):
-        r, g, b = rgb.get('r', 0), rgb.get('g', 0), rgb.get('b', 0)
-    elif isinstance(rgb, tuple):
-        r, g, b = rgb
-    else:
-        raise ValueError(f"Invalid RGB format: {rgb}")
-    return f"#{r:02X}{g:02X}{b:02X}"
+        try:
+            # One mapping-format call for the usual complete dict
+            return "#%(r)02X%(g)02X%(b)02X" % rgb
+        except KeyError:
+            return "#%02X%02X%02X" % (rgb.get('r', 0), rgb.get('g', 0), rgb.get('b', 0))
+    if isinstance(rgb, tuple):
+        return "#%02X%02X%02X" % rgb
+    raise ValueError(f"Invalid RGB format: {rgb}")
 
 
 def normalize_color(color: Union[str, Dict[str, int]]) -> str:
@@ -106,6 +161,231 @@ def normalize_color(color: Union[str, Dict[str, int]]) -> str:
         raise ValueError(f"Invalid color format: {color}")
 
 
+# Govee reports color components as r/g/b or red/green/blue depending on firmware
+_COLOR_KEYS = (('r', 'red'), ('g', 'green'), ('b', 'blue'))
+
+
+def rgb_from_state(color: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Read an RGB dict out of a Govee color value, whichever key names it uses.
+    
+    Args:
+        color: Color dict from the device list (r/g/b or red/green/blue keys)
+        
+    Returns:
+        Dictionary with 'r', 'g', 'b' keys (missing components default to 255)
+    """
+    rgb = {}
+    for short, long in _COLOR_KEYS:
+        value = color.get(short)
+        # A 0 component is a real value - only fall back when the key is absent
+        rgb[short] = value if value is not None else color.get(long, 255)
+    return rgb
+
+
+_PLAYER_NAME = operator.itemgetter('name')
+
+
+def player_name(player: Any) -> str:
+    """
+    Lowercased name of a player as reported by Lichess.
+    
+    Args:
+        player: Player dict with a 'name' key, or a bare username
+        
+    Returns:
+        Lowercased name ('' for a player dict without a name)
+    """
+    try:
+        return _PLAYER_NAME(player).lower()
+    except KeyError:
+        return ''
+    except TypeError:
+        return str(player).lower()
+
+
+def first_path_value(paths: tuple, game_data: Dict[str, Any], color: Optional[str]) -> Any:
+    """
+    Return the first non-None value found by a tuple of accessors.
+    Each accessor reads one known layout of Lichess game data; a layout
+    that doesn't apply simply raises and the next one is tried.
+    
+    Args:
+        paths: Accessors taking (game_data, color)
+        game_data: Game data from Lichess API
+        color: Our color ('white' or 'black'), or None if unknown
+        
+    Returns:
+        The first value found, or None if no layout matched
+    """
+    for path in paths:
+        try:
+            value = path(game_data, color)
+        except (KeyError, TypeError, IndexError):
+            continue
+        if value is not None:
+            return value
+    return None
+
+
+def _game_state(game_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Game state, which might be nested in a 'state' key."""
+    return game_data['state'] if 'state' in game_data else game_data
+
+
+def _check_flag(value: Any, color: Optional[str]) -> Optional[bool]:
+    """Interpret a 'check' field: a boolean, or the name of the side in check."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() == color:
+        return True
+    return None
+
+
+def _player_check(player_data: Any) -> Optional[bool]:
+    """Check flag from a per-player dict, or None if it has none."""
+    if isinstance(player_data, dict) and ('check' in player_data or 'inCheck' in player_data):
+        return bool(player_data.get('check') or player_data.get('inCheck'))
+    return None
+
+
+# Where each layout of game data keeps our remaining time, in the order they're tried
+_TIME_PATHS = (
+    lambda g, c: g['clock'][c],                                   # Streamed games / clock dict
+    lambda g, c: g['clock']['secondsLeft'],
+    lambda g, c: g['players'][c or 'white']['timeLeft'] / 1000.0,  # ms
+    lambda g, c: g['players'][c or 'white']['secondsLeft'],
+    lambda g, c: g[c]['timeLeft'] / 1000.0,                       # Direct white/black fields
+)
+
+# Where each layout of game data reports check, in the order they're tried
+_CHECK_PATHS = (
+    lambda g, c: _check_flag(_game_state(g)['check'], c),
+    lambda g, c: bool(_game_state(g)['inCheck']),
+    lambda g, c: _check_flag(g['status']['check'], c),
+    lambda g, c: _player_check(g[c]),
+    lambda g, c: _player_check(g['players'][c]),
+)
+
+
+class RateLimiter:
+    """
+    Token bucket for outgoing API calls.
+    Allows short bursts but keeps the sustained rate at `rate` calls per second.
+    """
+    
+    def __init__(self, rate: float = 1.0, burst: int = 3):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens that can accumulate
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def http_status(error: Exception) -> Optional[int]:
+    """
+    Get the HTTP status code carried by a berserk or requests exception.
+    
+    Args:
+        error: Exception raised by an API call
+        
+    Returns:
+        Status code, or None for errors without a response (timeouts, DNS, ...)
+    """
+    # berserk's ResponseError exposes it directly, requests' HTTPError via the response
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None:
+        status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status_code
+
+
+def is_permanent_client_error(error: Exception) -> bool:
+    """True for 4xx responses that retrying won't fix (e.g. a token missing a scope)."""
+    status_code = http_status(error)
+    return status_code is not None and 400 <= status_code < 500 and status_code not in RETRY_STATUS_CODES
+
+
+def retry_delay(error: Exception, attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    How long to wait before retrying a failed API call.
+    Honors the server's Retry-After header when present, otherwise uses
+    exponential backoff with jitter.
+    
+    Args:
+        error: Exception raised by the call
+        attempt: Number of consecutive failures so far (0 for the first)
+        base: Delay for the first retry in seconds
+        cap: Maximum backoff in seconds
+        
+    Returns:
+        Delay in seconds
+    """
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass  # HTTP-date form - fall back to backoff
+    return min(cap, base * 2 ** attempt) + random.random()
+
+
+# LAN command to turn the lamp off (encoded once, sent when restoring an "off" state)
+LAN_OFF_COMMAND = json_dumps_bytes({"msg": {"cmd": "turn", "data": {"value": 0}}})
+
+# config.json lives next to this script
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+
+LICHESS_PLAYING_URL = 'https://lichess.org/api/account/playing'
+LICHESS_GAMES_BY_USERS_URL = 'https://lichess.org/api/stream/games-by-users'
+GOVEE_CONTROL_URL = 'https://openapi.api.govee.com/v1/devices/control'
+GOVEE_DEVICES_URL = 'https://openapi.api.govee.com/router/api/v1/user/devices'
+GOVEE_MODEL = 'H6022'
+
+# Transient HTTP failures worth retrying (rate limit + gateway/server errors)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Delays between Lichess stream reconnect attempts before falling back to polling
+STREAM_RECONNECT_DELAYS = (0.3, 0.9, 2.7)
+
+# Identifier fields present on every entry of the Govee device list
+_DEVICE_FIELDS = operator.itemgetter('device', 'sku', 'deviceName')
+
+
+def device_fields(device: Dict[str, Any]) -> tuple:
+    """
+    Unpack (device id, sku, name) from a Govee device entry in one call.
+    
+    Args:
+        device: Device dict from the Govee device list
+        
+    Returns:
+        Tuple of (device id, sku, device name)
+    """
+    try:
+        return _DEVICE_FIELDS(device)
+    except KeyError:
+        return device.get('device', ''), device.get('sku'), device.get('deviceName')
+
+
 # Color themes for chess games
 THEMES = {
     "classic": {
@@ -190,11 +470,11 @@ def get_theme_colors(theme_name: Optional[str] = None) -> Dict[str, Any]:
     theme_name_lower = theme_name.lower()
     
     if theme_name_lower not in THEMES:
-        print(f"⚠️  Unknown theme '{theme_name}', using 'classic' theme")
+        log.warning(f"⚠️  Unknown theme '{theme_name}', using 'classic' theme")
         theme_name_lower = "classic"
     
     theme = THEMES[theme_name_lower]
-    print(f"✅ Using theme: {theme['name']}")
+    log.info(f"✅ Using theme: {theme['name']}")
     
     return {
         "my_turn_color": theme["my_turn_color"],
@@ -204,9 +484,37 @@ def get_theme_colors(theme_name: Optional[str] = None) -> Dict[str, Any]:
     }
 
 
+class GameObservation(NamedTuple):
+    """The parts of a game snapshot the update handler branches on, read once per update."""
+    status_name: str
+    is_my_turn: bool
+    winner_name: Optional[str]  # Lowercased, None while there is no winner
+    opponent_connected: bool
+    move_count: int  # Plies played so far
+
+
 class ChessLamp:
     """Main class to integrate Lichess game monitoring with Govee lamp control."""
     
+    # Seconds to wait for LAN control before also trying the cloud API
+    LAN_HEDGE_DELAY = 0.5
+    # Upper bound on one LAN/cloud race - past this the command is given up on
+    # (the slower transport may still land in the background)
+    LAMP_COMMAND_TIMEOUT = 6.0
+    # Queued updates arriving this close together (e.g. the turn color and the
+    # check color for the same move) are collapsed into the last one
+    LAMP_COALESCE_WINDOW = 0.01
+    
+    # Lichess game statuses that mean the game is over. Besides the usual endings
+    # the stream also reports games that end before or outside normal play
+    # (aborted, noStart, variantEnd...) - without these the lamp is left on the turn color
+    _TERMINAL_STATUSES = frozenset({
+        'mate', 'resign', 'draw', 'stalemate', 'timeout', 'outoftime', 'cheat', 'abandoned',
+        'aborted', 'noStart', 'unknownFinish', 'variantEnd'
+    })
+    _TIMEOUT_STATUSES = frozenset({'timeout', 'outoftime'})
+    _DRAW_STATUSES = frozenset({'draw', 'stalemate'})
+    
     def __init__(self, lichess_token: str, govee_api_key: str, govee_device_mac: str, govee_device_ip: Optional[str] = None, restore_color: Optional[Dict[str, int]] = None, restore_brightness: Optional[int] = None, theme: Optional[str] = None, my_turn_color: Optional[str] = None, opponent_turn_color: Optional[str] = None, my_turn_brightness: Optional[int] = None, opponent_turn_brightness: Optional[int] = None, gradual_dim_enabled: Optional[bool] = True, gradual_dim_duration: Optional[float] = 1.5, time_pressure_warning: Optional[int] = 30, time_pressure_critical: Optional[int] = 10, time_pressure_enabled: Optional[bool] = True, check_enabled: Optional[bool] = True, check_color: Optional[str] = None, check_brightness: Optional[int] = None, check_blink: Optional[bool] = True, move_notification_enabled: Optional[bool] = True, move_notification_color: Optional[str] = None, move_notification_brightness: Optional[int] = None, move_notification_duration: Optional[float] = None, celebration_enabled: Optional[bool] = True, celebration_win_color: Optional[str] = None, celebration_loss_color: Optional[str] = None, celebration_draw_color: Optional[str] = None, celebration_brightness: Optional[int] = None, celebration_pattern_count: Optional[int] = None):
         """
         Initialize the integration.
@@ -248,8 +556,29 @@ class ChessLamp:
         self.govee_device_mac = govee_device_mac
         self.govee_device_ip = govee_device_ip
         
-        # Initialize Lichess client
-        self.lichess_client = berserk.Client(session=berserk.TokenSession(lichess_token))
+        # Initialize Lichess client - the token session is also used directly for
+        # endpoints berserk doesn't wrap (games-by-users stream)
+        self.lichess_session = berserk.TokenSession(lichess_token)
+        # One pool for lichess.org with room for the open streams plus regular calls,
+        # so each API call reuses a warm keep-alive connection
+        self.lichess_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self.lichess_client = berserk.Client(session=self.lichess_session)
+        
+        # All non-streaming Lichess calls go through _lichess_call so the request
+        # rate stays bounded (1/sec sustained, bursts of 3)
+        self._lichess_limiter = RateLimiter(rate=1.0, burst=3)
+        
+        # Account identity never changes for a token - fetch it once instead of per poll
+        self.my_username: str = ''
+        self.my_user_id: str = ''
+        self._account_lock = threading.Lock()
+        
+        # Last ongoing-games list and its ETag, so unchanged polls can be answered with 304
+        self._playing_games: list = []
+        self._playing_by_id: Dict[str, Dict[str, Any]] = {}  # Same list indexed by game ID
+        self._playing_etag: Optional[str] = None
+        self._account_retry_at = 0.0
+        self._get_my_username()
         
         # Initialize Govee client
         if Govee is None:
@@ -257,22 +586,70 @@ class ChessLamp:
         self.govee_client = Govee(api_key=govee_api_key)
         self.govee_lib = GOVEE_LIB
         
+        # Shared HTTP session for the Govee cloud API - keeps the TLS connection
+        # alive between calls instead of handshaking on every color change
+        self.govee_session = requests.Session()
+        self.govee_session.headers.update({
+            "Govee-API-Key": govee_api_key,
+            "Content-Type": "application/json"
+        })
+        # Transient 429/5xx responses and connection errors are retried with backoff
+        # (0.3s, 0.6s, 1.2s); the last response is returned rather than raised
+        govee_retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET', 'PUT', 'POST']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self.govee_session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=govee_retry))
+        
+        # Normalized MAC for device matching, computed once
+        self._mac_normalized = govee_device_mac.replace(':', '').upper()
+        try:
+            self._mac_int: Optional[int] = int(self._mac_normalized, 16)
+        except ValueError:
+            self._mac_int = None
+        
+        # Cached device list response as (monotonic timestamp, data)
+        self._device_list_cache: tuple = (0.0, None)
+        # In-flight fetches by key, so concurrent callers share one request
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self._inflight_lock = threading.Lock()
+        
         # Get actual device identifier from API (MAC format might differ)
+        self._resolved_device_id: Optional[str] = None
         self.govee_device_id = self._get_device_id_from_api()
         
+        # Worker threads for racing LAN and cloud color commands. A race needs two, and
+        # one that timed out keeps its attempts running until their own request
+        # timeouts/retries end them - leave room for two such races to finish
+        self._lamp_io = concurrent.futures.ThreadPoolExecutor(max_workers=6, thread_name_prefix='lamp-io')
+        
+        # Worker threads for the cloud brightness PUT sent alongside the color PUT
+        # (a second one so an abandoned PUT can't hold up the next)
+        self._cloud_io = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='govee-cloud')
+        
+        # Worker thread for slow background chores (saving the pre-game lamp state, in-game blinks)
+        self._background = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='lamp-bg')
+        
         # Initialize LAN controller if available
         self.lan_controller = None
         if LAN_CONTROL_AVAILABLE and GoveeLANController:
             try:
                 self.lan_controller = GoveeLANController(govee_device_mac, govee_device_ip)
-                print("✅ LAN control initialized (using correct H6022 protocol format)")
+                log.info("✅ LAN control initialized (using correct H6022 protocol format)")
             except Exception as e:
-                print(f"⚠️  Could not initialize LAN controller: {e}")
+                log.warning(f"⚠️  Could not initialize LAN controller: {e}")
         
         # Track current game state
         self.current_game_id: Optional[str] = None
         self.is_my_turn: Optional[bool] = None
-        self.my_color: Optional[str] = None  # 'white' or 'black'
+        self.my_color = None  # 'white' or 'black' (also sets _opponent_color)
+        self._abandonment_handled: bool = False  # Opponent-left dim already applied this game
+        self._stop_event = threading.Event()  # Set by stop() to end the monitor loops
+        self._my_is_white = False  # Set once per streamed game from gameFull
         self.pre_game_state: Optional[Dict[str, Any]] = None  # Store state before game started
         
         # Color configuration - based on turn (not piece color)
@@ -291,12 +668,25 @@ class ChessLamp:
             self.my_turn_brightness = my_turn_brightness if my_turn_brightness is not None else 60  # 60% brightness when it's your turn
             self.opponent_turn_brightness = opponent_turn_brightness if opponent_turn_brightness is not None else 40  # 40% brightness for opponent's turn
         
+        # Last (r, g, b, brightness) successfully sent, to skip identical commands
+        self._last_lamp_state: Optional[tuple] = None
+        self._last_lamp_state_at = 0.0
+        
+        # Brightness the lamp was last set to by any transport (None if unknown)
+        self._known_brightness: Optional[int] = None
+        
+        # Encoded cloud API bodies keyed by command/value (see _cloud_payload)
+        self._cloud_payloads: Dict[tuple, bytes] = {}
+        
+        # Parsed RGB for each hex color string seen (see _color_rgb)
+        self._rgb_cache: Dict[str, Dict[str, int]] = {}
+        
         # Gradual dimming configuration
         self.gradual_dim_enabled = gradual_dim_enabled if gradual_dim_enabled is not None else True
         self.gradual_dim_duration = gradual_dim_duration if gradual_dim_duration is not None else 1.5
         
         # Config file path for hot reloading
-        self.config_path = os.path.join(os.path.dirname(__file__), 'config.json')
+        self.config_path = CONFIG_PATH
         self._config_last_modified = 0
         
         # Scene configuration (optional - use scenes instead of colors)
@@ -358,47 +748,246 @@ class ChessLamp:
         
         # Enable/disable flag - when False, lamp won't respond to game events
         self.enabled = True  # Enabled by default
+        
+        # Persistent event loop for async Govee libraries, run forever on its own
+        # thread (started on first use). Reusing one loop keeps the library's
+        # HTTP session alive between calls
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_thread: Optional[threading.Thread] = None
+        self._async_lock = threading.Lock()
+        
+        # Every color the lamp can be sent is known by now - encode them up front
+        self._prime_cloud_payloads()
+        
+        # Turn-color updates are sent by a worker thread so the monitor never waits
+        # on the lamp; only the newest pending update is kept (see queue_lamp_color)
+        self._lamp_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._lamp_queue_lock = threading.Lock()
+        # Bumped by every direct set_lamp_color call so a gradual dim in progress
+        # knows it has been superseded
+        self._direct_lamp_calls = 0
+        self._lamp_worker_thread = threading.Thread(target=self._lamp_worker, name='lamp-worker', daemon=True)
+        self._lamp_worker_thread.start()
+    
+    @property
+    def my_color(self) -> Optional[str]:
+        """Our color in the current game ('white' or 'black'), or None if unknown."""
+        return self._my_color
+    
+    @my_color.setter
+    def my_color(self, color: Optional[str]):
+        # Resolve the opponent's side once per game rather than on every update
+        self._my_color = color
+        self._opponent_color = 'black' if color == 'white' else 'white'
+    
+    def _lichess_call(self, fn, *args, **kwargs):
+        """
+        Call a berserk API method, waiting for the rate limiter first.
+        
+        Args:
+            fn: Bound berserk client method
+            *args, **kwargs: Passed through to fn
+        """
+        self._lichess_limiter.acquire()
+        return fn(*args, **kwargs)
+    
+    def _get_my_username(self) -> str:
+        """
+        Get the lowercased Lichess username for our token.
+        The account is fetched once; if that failed (e.g. Lichess was down at
+        startup) it is retried at most every 30 seconds.
+        
+        Returns:
+            Lowercased username, or '' if it isn't known yet
+        """
+        if self.my_username:
+            return self.my_username
+        with self._account_lock:
+            if not self.my_username and time.monotonic() >= self._account_retry_at:
+                try:
+                    user_info = self._lichess_call(self.lichess_client.account.get)
+                    self.my_user_id = user_info.get('id', '').lower()
+                    self.my_username = user_info.get('username', '').lower()
+                    log.info(f"✅ Lichess account: {user_info.get('username', '')}")
+                except Exception as e:
+                    self._account_retry_at = time.monotonic() + 30.0
+                    log.warning(f"⚠️  Could not fetch Lichess account: {e}")
+        return self.my_username
+    
+    def _get_async_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the background event loop, starting its thread on first use."""
+        with self._async_lock:
+            if self._async_loop is None or self._async_loop.is_closed():
+                self._async_loop = asyncio.new_event_loop()
+                self._async_thread = threading.Thread(
+                    target=self._async_loop.run_forever,
+                    name='govee-async', daemon=True
+                )
+                self._async_thread.start()
+            return self._async_loop
+    
+    def _run_async(self, coro, timeout: float = 10.0):
+        """
+        Run a coroutine on the background event loop and wait for its result.
+        
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait before giving up
+            
+        Returns:
+            The coroutine's result
+        """
+        loop = self._get_async_loop()
+        if threading.current_thread() is self._async_thread:
+            # Blocking here would stop the loop from ever running the coroutine
+            coro.close()
+            raise RuntimeError("_run_async called from the Govee event loop thread")
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+    
+    def _single_flight(self, key: str, fn, *args, **kwargs):
+        """
+        Run fn once for concurrent callers sharing the same key.
+        The first caller does the work; anyone arriving while it is in
+        flight waits for and receives the same result (or exception).
+        
+        Args:
+            key: Identifies the shared operation
+            fn: Callable to run
+            
+        Returns:
+            The result of fn
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._inflight[key] = future
+        if not leader:
+            return future.result()
+        
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def _fetch_devices(self, ttl: float = 30.0, timeout: float = 5) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the Govee device list, reusing a recent response.
+        Device lookup and state queries hit the same endpoint, so a short
+        TTL avoids spending Govee's rate budget on identical requests.
+        
+        Args:
+            ttl: Maximum age in seconds of a cached response
+            timeout: Request timeout in seconds
+            
+        Returns:
+            Parsed response JSON, or None if the request failed
+        """
+        fetched_at, cached = self._device_list_cache
+        if cached is not None and time.monotonic() - fetched_at < ttl:
+            return cached
+        return self._single_flight('devices', self._request_devices, timeout)
+    
+    def _request_devices(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """GET the Govee device list and refresh the cache on success."""
+        response = self.govee_session.get(GOVEE_DEVICES_URL, timeout=timeout)
+        if response.status_code != 200:
+            return None
+        data = json_loads(response.content)
+        self._device_list_cache = (time.monotonic(), data)
+        return data
+    
+    def _mac_match(self, device_id: str) -> int:
+        """
+        Rank how well a Govee device ID matches the configured MAC.
+        
+        Args:
+            device_id: Device ID from the Govee API (hex, with or without colons)
+            
+        Returns:
+            2 for an exact match, 1 if the ID contains the MAC, 0 otherwise
+        """
+        device_hex = device_id.replace(':', '')
+        if not device_hex:
+            return 0
+        try:
+            # Exact match compares as one integer - no case normalization needed
+            if int(device_hex, 16) == self._mac_int:
+                return 2
+        except ValueError:
+            pass
+        # Device IDs may be longer than the MAC (extra leading bytes)
+        return 1 if self._mac_normalized in device_hex.upper() else 0
+    
+    def _device_matches_mac(self, device_id: str) -> bool:
+        """Check whether a Govee device ID belongs to the configured MAC."""
+        return self._mac_match(device_id) > 0
     
     def _get_device_id_from_api(self) -> str:
-        """Get the actual device identifier from Govee API."""
+        """
+        Get the actual device identifier from Govee API.
+        The ID doesn't change while we run, so once the API has resolved it
+        later calls return it without another request.
+        """
+        if self._resolved_device_id is not None:
+            return self._resolved_device_id
+        device_id = self._lookup_device_id()
+        if device_id is None:
+            return self.govee_device_mac
+        self._resolved_device_id = device_id
+        return device_id
+    
+    def _lookup_device_id(self) -> Optional[str]:
+        """Find our device in the Govee device list, or None if the list is unavailable."""
         try:
-            headers = {
-                "Govee-API-Key": self.govee_api_key,
-                "Content-Type": "application/json"
-            }
-            response = requests.get(
-                "https://openapi.api.govee.com/router/api/v1/user/devices",
-                headers=headers,
-                timeout=5
-            )
-            if response.status_code == 200:
-                data = response.json()
+            data = self._fetch_devices(timeout=5)
+            if data is not None:
                 devices = data.get('data', [])
-                # Try to find device matching our MAC (case-insensitive, with or without colons)
-                mac_normalized = self.govee_device_mac.replace(':', '').upper()
+                # Try to find device matching our MAC (case-insensitive, with or without colons).
+                # An exact match wins outright; the first partial match and first H6022
+                # are remembered as fallbacks in the same pass
+                partial = None
+                first_h6022 = None
                 for device in devices:
-                    device_id = device.get('device', '')
-                    device_id_normalized = device_id.replace(':', '').upper()
-                    # Check if MAC matches (with or without colons)
-                    if (mac_normalized in device_id_normalized or 
-                        device_id_normalized in mac_normalized or
-                        self.govee_device_mac.upper() in device_id.upper()):
-                        print(f"✅ Found device: {device.get('deviceName')} ({device.get('sku')})")
+                    device_id, sku, name = device_fields(device)
+                    match = self._mac_match(device_id)
+                    if match == 2:
+                        log.info(f"✅ Found device: {name} ({sku})")
                         return device_id
+                    if match and partial is None:
+                        partial = (device_id, name, sku)
+                    if first_h6022 is None and sku == 'H6022':
+                        first_h6022 = (device_id, name)
+                if partial is not None:
+                    log.info(f"✅ Found device: {partial[1]} ({partial[2]})")
+                    return partial[0]
                 # If no match, use first H6022 device
-                for device in devices:
-                    if device.get('sku') == 'H6022':
-                        print(f"✅ Using first H6022 device: {device.get('deviceName')}")
-                        return device.get('device')
+                if first_h6022 is not None:
+                    log.info(f"✅ Using first H6022 device: {first_h6022[1]}")
+                    return first_h6022[0]
                 # Fallback to first device
                 if devices:
-                    print(f"⚠️  Using first available device: {devices[0].get('deviceName')}")
-                    return devices[0].get('device')
-            print(f"⚠️  Could not get device list, using MAC from config: {self.govee_device_mac}")
-            return self.govee_device_mac
+                    device_id, _, name = device_fields(devices[0])
+                    log.warning(f"⚠️  Using first available device: {name}")
+                    return device_id
+            log.warning(f"⚠️  Could not get device list, using MAC from config: {self.govee_device_mac}")
+            return None
         except Exception as e:
-            print(f"⚠️  Error getting device ID from API: {e}, using MAC from config")
-            return self.govee_device_mac
+            log.warning(f"⚠️  Error getting device ID from API: {e}, using MAC from config")
+            return None
         
     def get_lamp_state(self) -> Optional[Dict[str, Any]]:
         """
@@ -414,14 +1003,8 @@ class ChessLamp:
         # We'll try but won't fail if it doesn't work
         try:
             # Try to get device state from device list (includes current state)
-            api_url = "https://openapi.api.govee.com/router/api/v1/user/devices"
-            headers = {
-                "Govee-API-Key": self.govee_api_key,
-                "Content-Type": "application/json"
-            }
-            response = requests.get(api_url, headers=headers, timeout=3)  # Reduced from 5s to 3s for faster response
-            if response.status_code == 200:
-                data = response.json()
+            data = self._fetch_devices(timeout=3)  # Reduced from 5s to 3s for faster response
+            if data is not None:
                 # API returns data in different formats - try both
                 devices = []
                 if isinstance(data.get('data'), list):
@@ -435,49 +1018,42 @@ class ChessLamp:
                 
                 # Find our device
                 for device in devices:
-                    device_id = device.get('device', '')
-                    if (device_id == self.govee_device_id or 
-                        self.govee_device_mac.replace(':', '').upper() in device_id.replace(':', '').upper()):
+                    device_id = device_fields(device)[0]
+                    if device_id == self.govee_device_id or self._device_matches_mac(device_id):
+                        get = device.get
                         # Extract state information
                         state = {
-                            'onOff': device.get('onOff', 1),
-                            'brightness': device.get('brightness', 100),
+                            'onOff': get('onOff', 1),
+                            'brightness': get('brightness', 100),
                         }
                         
                         # Check for scene
-                        if 'scene' in device and device.get('scene'):
-                            state['scene'] = device.get('scene')
-                            print(f"✅ Retrieved lamp state - Current scene: {state['scene']}")
+                        scene = get('scene')
+                        if scene:
+                            state['scene'] = scene
+                            log.info(f"✅ Retrieved lamp state - Current scene: {state['scene']}")
                         
                         # Check for color - might be in different formats
                         color_found = False
-                        if 'color' in device:
-                            color_data = device.get('color')
+                        color_data = get('color')
+                        if color_data is not None:
                             if isinstance(color_data, dict):
                                 if 'r' in color_data or 'red' in color_data:
-                                    state['color'] = {
-                                        'r': color_data.get('r') or color_data.get('red', 255),
-                                        'g': color_data.get('g') or color_data.get('green', 255),
-                                        'b': color_data.get('b') or color_data.get('blue', 255)
-                                    }
+                                    state['color'] = rgb_from_state(color_data)
                                     color_found = True
                             elif isinstance(color_data, list) and len(color_data) >= 3:
                                 state['color'] = {'r': color_data[0], 'g': color_data[1], 'b': color_data[2]}
                                 color_found = True
                         
                         # Also check for properties that might contain color info
-                        if 'properties' in device:
-                            props = device.get('properties', [])
+                        props = get('properties')
+                        if props:
                             for prop in props:
                                 prop_name = prop.get('name', '').lower()
                                 if 'color' in prop_name:
                                     color_val = prop.get('value', {})
                                     if isinstance(color_val, dict):
-                                        state['color'] = {
-                                            'r': color_val.get('r') or color_val.get('red', 255),
-                                            'g': color_val.get('g') or color_val.get('green', 255),
-                                            'b': color_val.get('b') or color_val.get('blue', 255)
-                                        }
+                                        state['color'] = rgb_from_state(color_val)
                                         color_found = True
                                     elif isinstance(color_val, list) and len(color_val) >= 3:
                                         state['color'] = {'r': color_val[0], 'g': color_val[1], 'b': color_val[2]}
@@ -485,17 +1061,17 @@ class ChessLamp:
                         
                         if color_found:
                             hex_color = rgb_to_hex(state['color'])
-                            print(f"✅ Retrieved lamp state - Color: {hex_color}, Brightness: {state['brightness']}%")
+                            log.info(f"✅ Retrieved lamp state - Color: {hex_color}, Brightness: {state['brightness']}%")
                         elif state.get('scene'):
-                            print(f"✅ Retrieved lamp state - Scene: {state['scene']}, Brightness: {state['brightness']}%")
+                            log.info(f"✅ Retrieved lamp state - Scene: {state['scene']}, Brightness: {state['brightness']}%")
                         else:
-                            print(f"✅ Retrieved lamp state - Brightness: {state['brightness']}% (no color info available)")
+                            log.info(f"✅ Retrieved lamp state - Brightness: {state['brightness']}% (no color info available)")
                         return state
         except Exception as e:
-            print(f"⚠️  Could not get lamp state: {e}")
+            log.warning(f"⚠️  Could not get lamp state: {e}")
         
         # If we can't get state, return None (we'll just leave lamp as-is)
-        print("⚠️  Could not detect current lamp state/scene - lamp will remain as-is when game ends")
+        log.warning("⚠️  Could not detect current lamp state/scene - lamp will remain as-is when game ends")
         return None
     
     def restore_lamp_state(self, state: Optional[Dict[str, Any]]) -> bool:
@@ -503,17 +1079,20 @@ class ChessLamp:
         Restore lamp to a previous state.
         If state is None, use default restore color from config.
         """
+        # Restoration must always reach the lamp, even if it matches the last color sent
+        self._last_lamp_state = None
+        
         if state is None:
-            print("⚠️  No previous state saved - using default restore color from config")
+            log.warning("⚠️  No previous state saved - using default restore color from config")
             # Use default restore color when we don't have saved state
             default_color = self.default_restore_color
             default_brightness = self.default_restore_brightness
-            print(f"Restoring to default color: {default_color} at {default_brightness}%")
+            log.info(f"Restoring to default color: {default_color} at {default_brightness}%")
             if self.set_lamp_color(default_color, default_brightness):
-                print(f"✅ Restored lamp to default color: {default_color} at {default_brightness}%")
+                log.info(f"✅ Restored lamp to default color: {default_color} at {default_brightness}%")
                 return True
             else:
-                print(f"⚠️  Failed to restore default color")
+                log.warning(f"⚠️  Failed to restore default color")
                 return False
         
         try:
@@ -526,16 +1105,11 @@ class ChessLamp:
                 if not is_on:
                     # Turn off
                     if self.lan_controller:
-                        target_ip = self.lan_controller.device_ip
-                        if target_ip:
-                            import socket
-                            import json
-                            off_cmd = {"msg": {"cmd": "turn", "data": {"value": 0}}}
-                            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                            sock.settimeout(0.3)
-                            sock.sendto(json.dumps(off_cmd).encode('utf-8'), (target_ip, 4001))
-                            sock.close()
-                            print("✅ Restored lamp state (turned off)")
+                        # Non-blocking send on the controller's socket - UDP is fire-and-forget
+                        if self.lan_controller.send_datagram(LAN_OFF_COMMAND, 4001):
+                            self._last_lamp_state = None  # Lamp is off now
+                            self._known_brightness = None
+                            log.info("✅ Restored lamp state (turned off)")
                             return True
             
             # If it was on, restore scene/color
@@ -543,7 +1117,7 @@ class ChessLamp:
             if 'scene' in state and state.get('scene'):
                 scene_name = state.get('scene')
                 if self.set_lamp_scene(scene_name):
-                    print(f"✅ Restored lamp to scene: {scene_name}")
+                    log.info(f"✅ Restored lamp to scene: {scene_name}")
                     return True
             
             # Restore color if available
@@ -553,37 +1127,37 @@ class ChessLamp:
                     # Convert RGB dict to hex
                     hex_color = rgb_to_hex(color)
                     brightness = state.get('brightness', 100)
-                    print(f"Restoring lamp to {hex_color} at {brightness}% brightness...")
+                    log.info(f"Restoring lamp to {hex_color} at {brightness}% brightness...")
                     if self.set_lamp_color(hex_color, brightness):
-                        print(f"✅ Restored lamp color: {hex_color} at {brightness}%")
+                        log.info(f"✅ Restored lamp color: {hex_color} at {brightness}%")
                         return True
                     else:
-                        print(f"⚠️  Failed to restore color via set_lamp_color")
+                        log.warning(f"⚠️  Failed to restore color via set_lamp_color")
             
             # If we have state but no color/scene, use default restore color with configured restore brightness
             # Always use the configured restore_brightness, not the saved brightness
             default_color = self.default_restore_color
             default_brightness = self.default_restore_brightness
-            print(f"⚠️  No color info available - using default restore color {default_color} at {default_brightness}%")
+            log.warning(f"⚠️  No color info available - using default restore color {default_color} at {default_brightness}%")
             if self.set_lamp_color(default_color, default_brightness):
-                print(f"✅ Restored lamp to default color: {default_color} at {default_brightness}%")
+                log.info(f"✅ Restored lamp to default color: {default_color} at {default_brightness}%")
                 return True
             else:
-                print(f"⚠️  Failed to restore default color via set_lamp_color")
+                log.warning(f"⚠️  Failed to restore default color via set_lamp_color")
             
             # If we only have onOff state, at least ensure it's on
             if 'onOff' in state and state.get('onOff') == 1:
                 # Device was on, but we don't know color/brightness
                 # Just turn it on with a default setting
-                print("⚠️  Only have on/off state - turning on with default white at 50%")
+                log.warning("⚠️  Only have on/off state - turning on with default white at 50%")
                 if self.set_lamp_color("#FFFFFF", 50):
-                    print("✅ Turned lamp on with default settings")
+                    log.info("✅ Turned lamp on with default settings")
                     return True
             
-            print("⚠️  Could not restore lamp state (unknown format) - leaving as-is")
+            log.warning("⚠️  Could not restore lamp state (unknown format) - leaving as-is")
             return False
         except Exception as e:
-            print(f"⚠️  Error restoring lamp state: {e}")
+            log.warning(f"⚠️  Error restoring lamp state: {e}")
             return False
     
     def set_lamp_scene(self, scene_name: str) -> bool:
@@ -595,42 +1169,94 @@ class ChessLamp:
             scene_name: Name or ID of the scene (e.g., "Gaming", "Movie", "Sleep")
         """
         try:
-            api_url = "https://openapi.api.govee.com/v1/devices/control"
-            
-            headers = {
-                "Govee-API-Key": self.govee_api_key,
-                "Content-Type": "application/json"
-            }
-            
-            device = self.govee_device_id
-            model = "H6022"
-            
             # Try scene command
             payload = {
-                "device": device,
-                "model": model,
+                "device": self.govee_device_id,
+                "model": GOVEE_MODEL,
                 "cmd": {
                     "name": "scene",
                     "value": scene_name
                 }
             }
             
-            response = requests.put(api_url, headers=headers, json=payload, timeout=3)
-            result = response.json() if response.status_code == 200 else {}
+            # Whatever happens, the lamp may no longer show the last color we sent
+            self._last_lamp_state = None
+            response = self.govee_session.put(GOVEE_CONTROL_URL, data=json_dumps_bytes(payload), timeout=3)
+            result = json_loads(response.content) if response.status_code == 200 else {}
             
             if response.status_code == 200 and result.get('code') == 200:
-                print(f"✅ Lamp scene set to: {scene_name}")
+                log.info(f"✅ Lamp scene set to: {scene_name}")
                 return True
             else:
                 error_msg = result.get('message', f'HTTP {response.status_code}')
-                print(f"⚠️  Could not set scene '{scene_name}': {error_msg}")
-                print(f"   (H6022 may not support scenes, or scene name may be incorrect)")
+                log.warning(f"⚠️  Could not set scene '{scene_name}': {error_msg}")
+                log.info(f"   (H6022 may not support scenes, or scene name may be incorrect)")
                 return False
                 
         except Exception as e:
-            print(f"⚠️  Error setting scene: {e}")
+            log.warning(f"⚠️  Error setting scene: {e}")
             return False
     
+    def turn_lamp_setting(self, is_my_turn: bool) -> tuple:
+        """
+        Get the lamp setting for whose turn it is.
+        
+        Args:
+            is_my_turn: Whether it's the user's turn
+            
+        Returns:
+            Tuple of (color, brightness, label)
+        """
+        if is_my_turn:
+            return self.my_turn_color, self.my_turn_brightness, "It's your turn!"
+        return self.opponent_turn_color, self.opponent_turn_brightness, "Opponent's turn"
+    
+    def show_turn(self, is_my_turn: bool):
+        """
+        Queue the turn color (with gradual dim if enabled) for whose turn it is.
+        
+        Args:
+            is_my_turn: Whether it's the user's turn
+        """
+        color, brightness, label = self.turn_lamp_setting(is_my_turn)
+        log.info(f"{label} - Setting {color} at {brightness}% brightness")
+        self.queue_lamp_color(color, brightness=brightness, gradual_dim=self.gradual_dim_enabled, dim_duration=self.gradual_dim_duration)
+    
+    def queue_lamp_color(self, color: Union[str, Dict[str, int]], brightness: int = 100, gradual_dim: bool = False, dim_duration: float = 1.5):
+        """
+        Ask the lamp worker to set a color without blocking the caller.
+        A pending update that hasn't been sent yet is replaced, so rapid
+        turn changes collapse into the latest one.
+        
+        Args:
+            Same as set_lamp_color
+        """
+        with self._lamp_queue_lock:
+            self._discard_queued_lamp_color()
+            self._lamp_queue.put_nowait((color, brightness, gradual_dim, dim_duration))
+    
+    def _discard_queued_lamp_color(self):
+        """Drop the pending queued update, if any (call with _lamp_queue_lock held)."""
+        try:
+            self._lamp_queue.get_nowait()
+            self._lamp_queue.task_done()
+        except queue.Empty:
+            pass
+    
+    def _lamp_worker(self):
+        """Send queued lamp updates one at a time."""
+        while True:
+            color, brightness, gradual_dim, dim_duration = self._lamp_queue.get()
+            try:
+                time.sleep(self.LAMP_COALESCE_WINDOW)
+                if not self._lamp_queue.empty():
+                    continue  # Superseded while settling - the newer update is next
+                self.set_lamp_color(color, brightness=brightness, gradual_dim=gradual_dim, dim_duration=dim_duration)
+            except Exception as e:
+                log.warning(f"⚠️  Error setting queued lamp color: {e}")
+            finally:
+                self._lamp_queue.task_done()
+    
     def set_lamp_color(self, color: Union[str, Dict[str, int]], brightness: int = 100, gradual_dim: bool = False, dim_duration: float = 1.5):
         """
         Set the Govee lamp color.
@@ -643,100 +1269,209 @@ class ChessLamp:
             dim_duration: Duration of gradual dim in seconds (default: 1.5)
         """
         # Normalize color to RGB dict for internal use
-        if isinstance(color, str):
-            hex_color = normalize_color(color)
-            rgb = hex_to_rgb(hex_color)
-        else:
-            rgb = color
-            hex_color = rgb_to_hex(rgb)
+        rgb = self._color_rgb(color) if isinstance(color, str) else color
+        
+        # Direct calls (blinks, flashes, restores) replace a pending queued update rather
+        # than waiting behind it - effects re-show the turn color when they finish anyway
+        if threading.current_thread() is not self._lamp_worker_thread:
+            with self._lamp_queue_lock:
+                self._discard_queued_lamp_color()
+                self._direct_lamp_calls += 1
+                # The worker may be changing the lamp right now (e.g. mid-dim), so the
+                # repeat guard below can't be trusted
+                if self._lamp_queue.unfinished_tasks:
+                    self._last_lamp_state = None
+        
+        # Skip the command if the lamp was just set to this exact color and brightness
+        lamp_state = (rgb['r'], rgb['g'], rgb['b'], brightness)
+        if lamp_state == self._last_lamp_state and time.monotonic() - self._last_lamp_state_at < 60:
+            return True
         
         # If gradual dimming is enabled, first set color at full brightness, then dim
         if gradual_dim and brightness < 100:
-            print(f"🌅 Starting gradual dim from 100% to {brightness}% over {dim_duration}s")
+            log.info(f"🌅 Starting gradual dim from 100% to {brightness}% over {dim_duration}s")
             # Set color at full brightness first
             if self._set_lamp_color_immediate(rgb, 100):
                 # Small delay to ensure color is set
                 time.sleep(0.1)
-                # Now gradually dim to target brightness
-                self._gradual_dim_brightness(rgb, 100, brightness, dim_duration)
-                return True
-            return False
+                # Now gradually dim to target brightness - if a step failed the lamp
+                # may be stuck part-way, so don't let the repeat guard skip a resend
+                if not self._gradual_dim_brightness(rgb, 100, brightness, dim_duration):
+                    lamp_state = None
+                result = True
+            else:
+                result = False
         else:
             # Normal immediate color change
-            return self._set_lamp_color_immediate(rgb, brightness)
+            result = self._set_lamp_color_immediate(rgb, brightness)
+        
+        if result:
+            self._last_lamp_state = lamp_state
+            self._last_lamp_state_at = time.monotonic()
+        return result
     
     def _set_lamp_color_immediate(self, rgb: Dict[str, int], brightness: int) -> bool:
-        """Internal method to set color immediately without gradual dimming."""
-        hex_color = rgb_to_hex(rgb)
+        """
+        Internal method to set color immediately without gradual dimming.
+        LAN is tried first; if it hasn't answered within LAN_HEDGE_DELAY
+        (e.g. it is still discovering the device), the cloud API is raced
+        against it and the first success wins.
+        """
+        if not self.lan_controller:
+            return self._set_lamp_color_cloud(rgb, brightness)
         
-        # Try LAN control first (now using correct format!)
-        if self.lan_controller:
-            try:
-                if self.lan_controller.set_color(rgb['r'], rgb['g'], rgb['b'], brightness):
-                    print(f"✅ Lamp color set via LAN to {hex_color}")
-                    return True
-            except Exception as e:
-                print(f"⚠️  LAN control failed: {e}, trying cloud API...")
+        lan_future = self._lamp_io.submit(self._set_lamp_color_lan, rgb, brightness)
+        try:
+            if lan_future.result(timeout=self.LAN_HEDGE_DELAY):
+                return True
+            # LAN failed outright - cloud is the only option left
+            return self._set_lamp_color_cloud(rgb, brightness)
+        except concurrent.futures.TimeoutError:
+            pass
         
-        # Fall back to cloud API
+        log.warning("⚠️  LAN control is slow - racing cloud API...")
+        cloud_future = self._lamp_io.submit(self._set_lamp_color_cloud, rgb, brightness)
+        try:
+            for future in concurrent.futures.as_completed([lan_future, cloud_future],
+                                                          timeout=self.LAMP_COMMAND_TIMEOUT):
+                if future.result():
+                    return True
+        except concurrent.futures.TimeoutError:
+            log.warning(f"⚠️  Lamp did not respond within {self.LAMP_COMMAND_TIMEOUT:g}s")
+            # An attempt still waiting for a worker would only send a stale color later
+            lan_future.cancel()
+            cloud_future.cancel()
+        return False
+    
+    def _set_lamp_color_lan(self, rgb: Dict[str, int], brightness: int) -> bool:
+        """Set color via LAN control (now using correct format!)."""
+        try:
+            if self.lan_controller.set_color(rgb['r'], rgb['g'], rgb['b'], brightness):
+                # LAN only sends brightness when it's above zero
+                self._known_brightness = brightness if brightness > 0 else None
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("✅ Lamp color set via LAN to %s", rgb_to_hex(rgb))
+                return True
+        except Exception as e:
+            log.warning(f"⚠️  LAN control failed: {e}, trying cloud API...")
+        return False
+    
+    def _set_lamp_color_cloud(self, rgb: Dict[str, int], brightness: int) -> bool:
+        """Set color via the Govee cloud API, falling back to the library."""
+        started = time.monotonic()
         try:
             # Try using the official Govee REST API directly
             # Try the v1 endpoint first (standard API)
-            api_url = "https://openapi.api.govee.com/v1/devices/control"
+            # Payload bodies are encoded once per distinct value (see _cloud_payload)
+            payload = self._cloud_payload('color', rgb)
             
-            headers = {
-                "Govee-API-Key": self.govee_api_key,
-                "Content-Type": "application/json"
-            }
+            # Brightness is a separate command - send it alongside the color rather than
+            # after it, unless the lamp is already at that level (e.g. blinks and color
+            # changes at a steady turn brightness)
+            brightness_future = None
+            if brightness != self._known_brightness:
+                brightness_payload = self._cloud_payload('brightness', brightness)
+                brightness_future = self._cloud_io.submit(self.govee_session.put, GOVEE_CONTROL_URL, data=brightness_payload, timeout=5)
             
-            # Use the device ID from API (might be different format than MAC)
-            device = self.govee_device_id
-            model = "H6022"
+            response = self.govee_session.put(GOVEE_CONTROL_URL, data=payload, timeout=5)
+            result = json_loads(response.content) if response.status_code == 200 else {}
             
-            # Convert RGB to the format Govee expects
-            payload = {
-                "device": device,
-                "model": model,
-                "cmd": {
-                    "name": "color",
-                    "value": {
-                        "r": rgb['r'],
-                        "g": rgb['g'],
-                        "b": rgb['b']
-                    }
-                }
-            }
-            
-            response = requests.put(api_url, headers=headers, json=payload, timeout=5)
-            result = response.json() if response.status_code == 200 else {}
+            if brightness_future is not None:
+                # Retries (and Retry-After on a 429) can stretch the brightness PUT well past
+                # the lamp command budget - don't hold this thread for longer than that
+                remaining = max(0.0, self.LAMP_COMMAND_TIMEOUT - (time.monotonic() - started))
+                try:
+                    brightness_ok = brightness_future.result(timeout=remaining).status_code == 200
+                except Exception:  # Includes the timeout - resend the brightness next time
+                    brightness_ok = False
+                self._known_brightness = brightness if brightness_ok else None
             
             # Check if it worked
             if response.status_code == 200 and result.get('code') == 200:
-                # Also set brightness
-                brightness_payload = {
-                    "device": device,
-                    "model": model,
-                    "cmd": {
-                        "name": "brightness",
-                        "value": brightness
-                    }
-                }
-                requests.put(api_url, headers=headers, json=brightness_payload, timeout=5)
-                print(f"✅ Lamp color set to {hex_color}")
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("✅ Lamp color set to %s", rgb_to_hex(rgb))
                 return True
             else:
                 # H6022 might not support cloud API - print warning but don't fail completely
                 error_msg = result.get('message', f'HTTP {response.status_code}')
-                print(f"⚠️  Govee cloud API not available for H6022: {error_msg}")
-                print(f"   (H6022 may require LAN control or may not support API)")
+                log.warning(f"⚠️  Govee cloud API not available for H6022: {error_msg}")
+                log.info(f"   (H6022 may require LAN control or may not support API)")
                 # Still try library as fallback
                 return self._set_lamp_color_library(rgb, brightness)
                 
         except Exception as e:
-            print(f"⚠️  Direct API call failed: {e}, trying library method...")
+            log.warning(f"⚠️  Direct API call failed: {e}, trying library method...")
             # Fall back to library method
             return self._set_lamp_color_library(rgb, brightness)
     
+    def _cloud_payload(self, name: str, value: Union[int, Dict[str, int]]) -> bytes:
+        """
+        Get the encoded v1 control body for a command.
+        Each distinct value is JSON-encoded once and reused on later calls.
+        
+        Args:
+            name: Command name ("color" or "brightness")
+            value: RGB dict for color, integer for brightness
+        """
+        if isinstance(value, dict):
+            key = (name, value['r'], value['g'], value['b'])
+            value = {'r': value['r'], 'g': value['g'], 'b': value['b']}
+        else:
+            key = (name, value)
+        payload = self._cloud_payloads.get(key)
+        if payload is None:
+            payload = json_dumps_bytes({
+                "device": self.govee_device_id,
+                "model": GOVEE_MODEL,
+                "cmd": {
+                    "name": name,
+                    "value": value
+                }
+            })
+            self._cloud_payloads[key] = payload
+        return payload
+    
+    def _color_rgb(self, color: str) -> Dict[str, int]:
+        """
+        Convert a hex color string to an RGB dict, reusing earlier conversions.
+        Only a handful of colors are ever configured, so each is parsed once.
+        
+        Args:
+            color: Hex color string (e.g., "#00FF00" or "00FF00")
+            
+        Returns:
+            Dictionary with 'r', 'g', 'b' keys (shared - don't modify)
+        """
+        rgb = self._rgb_cache.get(color)
+        if rgb is None:
+            rgb = hex_to_rgb(normalize_color(color))
+            if len(self._rgb_cache) < 64:  # Colors from the API are arbitrary - keep it bounded
+                self._rgb_cache[color] = rgb
+        return rgb
+    
+    def _prime_cloud_payloads(self):
+        """Pre-encode the cloud payloads for every configured color so sends are a dict lookup."""
+        settings = [
+            (self.my_turn_color, self.my_turn_brightness),
+            (self.opponent_turn_color, self.opponent_turn_brightness),
+            (self.default_restore_color, self.default_restore_brightness),
+            (self.check_color, self.check_brightness),
+            (self.move_notification_color, self.move_notification_brightness),
+            (self.celebration_win_color, self.celebration_brightness),
+            (self.celebration_loss_color, self.celebration_brightness),
+            (self.celebration_draw_color, self.celebration_brightness),
+        ]
+        for color, brightness in settings:
+            try:
+                self._cloud_payload('color', self._color_rgb(color))
+                # Derived levels: check blink (quarter) and opponent-left dim (half)
+                for level in (brightness, max(1, brightness // 4), max(1, brightness // 2)):
+                    self._cloud_payload('brightness', level)
+            except ValueError:
+                pass  # Invalid colors are reported when they're actually used
+        # Gradual dims always start from full brightness
+        self._cloud_payload('brightness', 100)
+    
     def _gradual_dim_brightness(self, rgb: Dict[str, int], start_brightness: int, end_brightness: int, duration: float):
         """
         Gradually dim brightness from start to end over duration.
@@ -746,18 +1481,27 @@ class ChessLamp:
             start_brightness: Starting brightness (0-100)
             end_brightness: Target brightness (0-100)
             duration: Duration in seconds
+            
+        Returns:
+            True if the final step reached the lamp
         """
         if start_brightness == end_brightness:
-            return
+            return True
         
         steps = max(10, int(duration * 10))  # At least 10 steps, or 10 steps per second
         step_delay = duration / steps
         
         brightness_range = end_brightness - start_brightness
         
-        print(f"   Dimming: {start_brightness}% → {end_brightness}% in {steps} steps")
+        log.debug("   Dimming: %s%% → %s%% in %s steps", start_brightness, end_brightness, steps)
         
+        direct_calls = self._direct_lamp_calls
+        step_ok = False
         for i in range(steps + 1):
+            if self._direct_lamp_calls != direct_calls:
+                log.debug("   Dimming interrupted by a newer lamp command")
+                return False
+            
             # Linear interpolation
             progress = i / steps
             current_brightness = int(start_brightness + (brightness_range * progress))
@@ -767,26 +1511,31 @@ class ChessLamp:
             if self.lan_controller:
                 try:
                     # Use brightness-only method for smoother dimming
-                    self.lan_controller.set_brightness_only(current_brightness)
+                    step_ok = self.lan_controller.set_brightness_only(current_brightness)
+                    self._known_brightness = current_brightness if step_ok else None
                     # Small delay to allow command to process
                     if i < steps:
                         time.sleep(step_delay)
                 except Exception as e:
-                    print(f"   ⚠️  Dimming step failed: {e}")
-                    pass  # Continue if LAN fails during dimming
+                    log.warning(f"   ⚠️  Dimming step failed: {e}")
+                    # Continue if LAN fails during dimming
+                    step_ok = False
+                    self._known_brightness = None
             else:
                 # Fallback: use immediate method with brightness
                 try:
-                    self._set_lamp_color_immediate(rgb, current_brightness)
+                    step_ok = self._set_lamp_color_immediate(rgb, current_brightness)
                 except:
-                    pass
+                    step_ok = False
                 if i < steps:
                     time.sleep(step_delay)
         
-        print(f"   ✅ Dimming complete: {end_brightness}%")
+        log.debug("   ✅ Dimming complete: %s%%", end_brightness)
+        return step_ok
     
     def _set_lamp_color_library(self, rgb: Dict[str, int], brightness: int = 100):
         """Fallback method using the library."""
+        hex_color = rgb_to_hex(rgb)
         try:
             # Different Govee libraries have different APIs
             if self.govee_lib == 'laggat':
@@ -794,17 +1543,18 @@ class ChessLamp:
                 async def _set_color_async():
                     # Ensure lamp is on
                     await self.govee_client.turn_on(self.govee_device_mac)
-                    # Set color (RGB tuple)
-                    result = await self.govee_client.set_color(
-                        self.govee_device_mac,
-                        (rgb['r'], rgb['g'], rgb['b'])
+                    # Color (RGB tuple) and brightness are independent - send them together
+                    result, _ = await asyncio.gather(
+                        self.govee_client.set_color(
+                            self.govee_device_mac,
+                            (rgb['r'], rgb['g'], rgb['b'])
+                        ),
+                        self.govee_client.set_brightness(self.govee_device_mac, brightness)
                     )
-                    # Set brightness
-                    await self.govee_client.set_brightness(self.govee_device_mac, brightness)
                     return result
                 
-                # Run async function
-                result = asyncio.run(_set_color_async())
+                # Run on the background loop (asyncio.run would rebuild the loop every call)
+                result = self._run_async(_set_color_async())
             elif self.govee_lib == 'async':
                 # aiogovee might be async
                 async def _set_color_async():
@@ -813,7 +1563,7 @@ class ChessLamp:
                         {'color': {'r': rgb['r'], 'g': rgb['g'], 'b': rgb['b']}, 'brightness': brightness}
                     )
                     return result
-                result = asyncio.run(_set_color_async())
+                result = self._run_async(_set_color_async())
             else:
                 # Standard govee-api (synchronous)
                 result = self.govee_client.set_color(
@@ -825,17 +1575,17 @@ class ChessLamp:
             if isinstance(result, tuple) and len(result) == 2:
                 success, message = result
                 if not success:
-                    print(f"⚠️  Govee library returned error: {message}")
+                    log.warning(f"⚠️  Govee library returned error: {message}")
                     return None
                 else:
-                    print(f"✅ Lamp color set to {hex_color}")
+                    log.debug("✅ Lamp color set to %s", hex_color)
             else:
-                print(f"✅ Lamp color set to {hex_color}")
+                log.debug("✅ Lamp color set to %s", hex_color)
+            self._known_brightness = brightness
             return result
         except Exception as e:
-            print(f"❌ Error setting lamp color with library: {e}")
-            import traceback
-            traceback.print_exc()
+            log.error(f"❌ Error setting lamp color with library: {e}")
+            log.debug("Govee library color command failed", exc_info=True)
             return None
     
     def get_time_remaining(self, game_data: Dict[str, Any]) -> Optional[float]:
@@ -849,50 +1599,9 @@ class ChessLamp:
             Time remaining in seconds, or None if not available
         """
         try:
-            # Try different possible locations for clock data
-            # Format 1: Direct clock field
-            if 'clock' in game_data:
-                clock = game_data['clock']
-                if isinstance(clock, dict):
-                    # Check for white/black time
-                    if self.my_color == 'white' and 'white' in clock:
-                        return clock['white']
-                    elif self.my_color == 'black' and 'black' in clock:
-                        return clock['black']
-                    # Or might be in secondsLeft
-                    if 'secondsLeft' in clock:
-                        return clock['secondsLeft']
-            
-            # Format 2: In players data
-            if 'players' in game_data:
-                players = game_data['players']
-                my_color_key = self.my_color if self.my_color else 'white'
-                if my_color_key in players:
-                    player_data = players[my_color_key]
-                    if isinstance(player_data, dict):
-                        # Check for timeLeft or secondsLeft
-                        if 'timeLeft' in player_data:
-                            return player_data['timeLeft'] / 1000.0  # Convert ms to seconds
-                        if 'secondsLeft' in player_data:
-                            return player_data['secondsLeft']
-            
-            # Format 3: Direct white/black fields with time
-            if self.my_color == 'white' and 'white' in game_data:
-                white_data = game_data['white']
-                if isinstance(white_data, dict) and 'timeLeft' in white_data:
-                    return white_data['timeLeft'] / 1000.0
-            
-            if self.my_color == 'black' and 'black' in game_data:
-                black_data = game_data['black']
-                if isinstance(black_data, dict) and 'timeLeft' in black_data:
-                    return black_data['timeLeft'] / 1000.0
-            
-            # Format 4: Check for 'lastMoveAt' and calculate from time control
-            # This is more complex and less reliable, so we'll skip it for now
-            
-            return None
-        except Exception as e:
-            print(f"⚠️  Error extracting time: {e}")
+            return first_path_value(_TIME_PATHS, game_data, self.my_color)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            log.warning(f"⚠️  Error extracting time: {e}")
             return None
     
     def blink_lamp(self, color: Union[str, Dict[str, int]], base_brightness: int, blink_count: int = 3, blink_duration: float = 0.3):
@@ -912,16 +1621,41 @@ class ChessLamp:
         try:
             for _ in range(blink_count):
                 # Turn brightness down (blink off)
+                step_start = time.monotonic()
                 self.set_lamp_color(color, brightness=max(1, base_brightness // 4))
-                time.sleep(blink_duration)
+                sleep_until(step_start + blink_duration)
                 # Turn brightness back up (blink on)
+                step_start = time.monotonic()
                 self.set_lamp_color(color, brightness=base_brightness)
-                time.sleep(blink_duration)
+                sleep_until(step_start + blink_duration)
         except Exception as e:
-            print(f"⚠️  Error during blink: {e}")
+            log.warning(f"⚠️  Error during blink: {e}")
         finally:
             self._blinking_active = False
     
+    def blink_in_background(self, color: Union[str, Dict[str, int]], base_brightness: int, blink_count: int = 3, blink_duration: float = 0.3):
+        """
+        Blink on the background worker so the game loop keeps following the game.
+        Afterwards the lamp is set back to whichever turn color is current,
+        in case the turn changed while the blink was running.
+        
+        Args:
+            color: RGB color to use
+            base_brightness: Base brightness level
+            blink_count: Number of blinks
+            blink_duration: Duration of each blink (seconds)
+        """
+        if self._blinking_active:
+            return  # Already blinking, don't interrupt
+        
+        def _blink_then_show_turn():
+            self.blink_lamp(color, base_brightness, blink_count, blink_duration)
+            if self.current_game_id and self.is_my_turn is not None:
+                turn_color, turn_brightness, _ = self.turn_lamp_setting(self.is_my_turn)
+                self.set_lamp_color(turn_color, brightness=turn_brightness)
+        
+        self._background.submit(_blink_then_show_turn)
+    
     def is_in_check(self, game_data: Dict[str, Any]) -> bool:
         """
         Detect if the current player is in check.
@@ -936,61 +1670,10 @@ class ChessLamp:
             return False
         
         try:
-            # Extract game state - might be nested in 'state' key
-            if 'state' in game_data:
-                game_state = game_data['state']
-            else:
-                game_state = game_data
-            
-            # Check various possible fields for check status
-            # Format 1: Direct 'check' field (boolean or string)
-            if 'check' in game_state:
-                check_value = game_state['check']
-                if isinstance(check_value, bool):
-                    return check_value
-                elif isinstance(check_value, str):
-                    # Might be "white", "black", or empty string
-                    if check_value.lower() == self.my_color:
-                        return True
-            
-            # Format 2: 'inCheck' field
-            if 'inCheck' in game_state:
-                return bool(game_state['inCheck'])
-            
-            # Format 3: Check in status field
-            if 'status' in game_data:
-                status = game_data['status']
-                if isinstance(status, dict):
-                    if 'check' in status:
-                        check_value = status['check']
-                        if isinstance(check_value, bool):
-                            return check_value
-                        elif isinstance(check_value, str) and check_value.lower() == self.my_color:
-                            return True
-            
-            # Format 4: Check in 'white' or 'black' player data
-            if self.my_color and self.my_color in game_data:
-                player_data = game_data[self.my_color]
-                if isinstance(player_data, dict):
-                    if 'check' in player_data or 'inCheck' in player_data:
-                        return bool(player_data.get('check') or player_data.get('inCheck'))
-            
-            # Format 5: Check in 'players' data
-            if 'players' in game_data and self.my_color:
-                players = game_data['players']
-                if self.my_color in players:
-                    player_data = players[self.my_color]
-                    if isinstance(player_data, dict):
-                        if 'check' in player_data or 'inCheck' in player_data:
-                            return bool(player_data.get('check') or player_data.get('inCheck'))
-            
-            # Format 6: Check FEN string (if available) - last character might indicate check
-            # FEN format: ... w KQkq - 0 1
-            # The presence of check might be in the move notation or status
-            
-            return False
-        except Exception as e:
-            print(f"⚠️  Error detecting check: {e}")
+            # Check status is reported in several layouts (see _CHECK_PATHS)
+            return bool(first_path_value(_CHECK_PATHS, game_data, self.my_color))
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            log.warning(f"⚠️  Error detecting check: {e}")
             return False
     
     def handle_check(self, game_data: Dict[str, Any], is_my_turn: bool):
@@ -1017,23 +1700,20 @@ class ChessLamp:
         
         if in_check and not self._check_handled:
             self._check_handled = True
-            print(f"⚠️  CHECK! You are in check!")
+            log.warning(f"⚠️  CHECK! You are in check!")
             if self.check_blink:
                 # Blink with check color, then return to normal turn color
-                print(f"⚠️  Blinking {self.check_color} to indicate check!")
-                self.blink_lamp(self.check_color, self.check_brightness, blink_count=3, blink_duration=0.2)
-                # After blinking, return to normal turn color
-                time.sleep(0.1)  # Brief pause
-                self.set_lamp_color(self.my_turn_color, brightness=self.my_turn_brightness)
+                log.warning(f"⚠️  Blinking {self.check_color} to indicate check!")
+                self.blink_in_background(self.check_color, self.check_brightness, blink_count=3, blink_duration=0.2)
             else:
                 # Just set check color (overrides turn color while in check)
-                print(f"⚠️  Setting lamp to {self.check_color} to indicate check!")
-                self.set_lamp_color(self.check_color, brightness=self.check_brightness)
+                log.warning(f"⚠️  Setting lamp to {self.check_color} to indicate check!")
+                self.queue_lamp_color(self.check_color, brightness=self.check_brightness)
         elif not in_check and self._check_handled:
             # Check resolved - return to normal turn color
             self._check_handled = False
-            print(f"✅ Check resolved - returning to normal turn color {self.my_turn_color}")
-            self.set_lamp_color(self.my_turn_color, brightness=self.my_turn_brightness)
+            log.info(f"✅ Check resolved - returning to normal turn color {self.my_turn_color}")
+            self.queue_lamp_color(self.my_turn_color, brightness=self.my_turn_brightness)
     
     def handle_time_pressure(self, game_data: Dict[str, Any], is_my_turn: bool):
         """
@@ -1064,11 +1744,11 @@ class ChessLamp:
             self._last_warning_threshold = current_threshold
             if not self._blinking_active:
                 if current_threshold == 'critical':
-                    print(f"⏰ CRITICAL TIME: {time_remaining:.1f}s remaining - Fast blinking!")
-                    self.blink_lamp(self.my_turn_color, self.my_turn_brightness, blink_count=2, blink_duration=0.2)
+                    log.info(f"⏰ CRITICAL TIME: {time_remaining:.1f}s remaining - Fast blinking!")
+                    self.blink_in_background(self.my_turn_color, self.my_turn_brightness, blink_count=2, blink_duration=0.2)
                 elif current_threshold == 'warning':
-                    print(f"⏰ Time pressure: {time_remaining:.1f}s remaining - Blinking!")
-                    self.blink_lamp(self.my_turn_color, self.my_turn_brightness, blink_count=1, blink_duration=0.3)
+                    log.info(f"⏰ Time pressure: {time_remaining:.1f}s remaining - Blinking!")
+                    self.blink_in_background(self.my_turn_color, self.my_turn_brightness, blink_count=1, blink_duration=0.3)
         
         # Reset threshold if time goes back above warning (e.g., time added)
         if current_threshold is None:
@@ -1085,6 +1765,11 @@ class ChessLamp:
             Number of moves made in the game
         """
         try:
+            # Streamed games keep a running count
+            ply_count = game_data.get('plyCount')
+            if ply_count is not None:
+                return ply_count
+            
             # Extract game state - might be nested in 'state' key
             if 'state' in game_data:
                 game_state = game_data['state']
@@ -1093,15 +1778,38 @@ class ChessLamp:
             
             # Get moves string and count
             moves = game_state.get('moves', '')
-            if moves:
-                # Moves are space-separated, count them
-                move_list = moves.split()
-                return len(move_list)
-            return 0
-        except Exception as e:
-            print(f"⚠️  Error extracting move count: {e}")
+            # Lichess separates moves with single spaces - count them without splitting
+            return moves.count(' ') + 1 if moves else 0
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            log.warning(f"⚠️  Error extracting move count: {e}")
             return 0
     
+    def _infer_my_color(self, game_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Work out which color we're playing in a game.
+        
+        Args:
+            game_data: Game data from Lichess API
+            
+        Returns:
+            'white', 'black', or None if it can't be determined
+        """
+        # The game data usually has a 'color' field that directly tells us
+        color = game_data.get('color')
+        if color:
+            return color.lower()
+        
+        # Fallback: compare our username against the white/black fields
+        my_username = self._get_my_username()
+        for side in ('white', 'black'):
+            player = game_data.get(side)
+            if player is None:
+                continue
+            name = player_name(player)
+            if name == my_username:
+                return side
+        return None
+    
     def get_game_result(self, game_data: Dict[str, Any]) -> Optional[str]:
         """
         Determine game result from game data.
@@ -1114,13 +1822,12 @@ class ChessLamp:
         """
         try:
             # Get current user's username
-            user_info = self.lichess_client.account.get()
-            my_username = user_info.get('username', '').lower()
+            my_username = self._get_my_username()
             
             # Check for winner
             winner = game_data.get('winner')
             if winner:
-                winner_username = winner.get('name', '').lower() if isinstance(winner, dict) else str(winner).lower()
+                winner_username = player_name(winner)
                 if winner_username == my_username:
                     return 'win'
                 else:
@@ -1133,7 +1840,7 @@ class ChessLamp:
             else:
                 status_name = str(status)
             
-            if status_name in ['draw', 'stalemate']:
+            if status_name in self._DRAW_STATUSES:
                 return 'draw'
             
             # Check if game ended without winner (could be draw or abandoned)
@@ -1142,7 +1849,7 @@ class ChessLamp:
                 return 'draw'
             
             # If game ended but no winner and not explicitly draw, might be loss (timeout, etc.)
-            if status_name in ['timeout', 'outoftime']:
+            if status_name in self._TIMEOUT_STATUSES:
                 # Need to check who timed out
                 # If it's our timeout, it's a loss
                 # This is tricky to determine, so we'll be conservative
@@ -1150,7 +1857,7 @@ class ChessLamp:
             
             return None
         except Exception as e:
-            print(f"⚠️  Error determining game result: {e}")
+            log.warning(f"⚠️  Error determining game result: {e}")
             return None
     
     def celebrate_game_result(self, result: str):
@@ -1165,22 +1872,22 @@ class ChessLamp:
         
         try:
             if result == 'win':
-                print(f"🎉 You won! Celebrating with {self.celebration_win_color} pulses!")
+                log.info(f"🎉 You won! Celebrating with {self.celebration_win_color} pulses!")
                 # Green pulse pattern for win
                 self.pulse_lamp(self.celebration_win_color, self.celebration_brightness, 
                                self.celebration_pattern_count, 0.4)  # Slightly longer pulses
             elif result == 'loss':
-                print(f"😞 You lost. Showing {self.celebration_loss_color} indication...")
+                log.info(f"😞 You lost. Showing {self.celebration_loss_color} indication...")
                 # Red flash pattern for loss (less celebratory)
                 self.blink_lamp(self.celebration_loss_color, self.celebration_brightness, 
                                self.celebration_pattern_count, 0.25)  # Slightly longer flashes
             elif result == 'draw':
-                print(f"🤝 Draw game. Showing {self.celebration_draw_color} indication...")
+                log.info(f"🤝 Draw game. Showing {self.celebration_draw_color} indication...")
                 # Yellow flash pattern for draw
                 self.blink_lamp(self.celebration_draw_color, self.celebration_brightness, 
                                self.celebration_pattern_count, 0.25)  # Slightly longer flashes
         except Exception as e:
-            print(f"⚠️  Error during celebration: {e}")
+            log.warning(f"⚠️  Error during celebration: {e}")
     
     def pulse_lamp(self, color: Union[str, Dict[str, int]], brightness: int, pulse_count: int = 3, pulse_duration: float = 0.3):
         """
@@ -1200,37 +1907,41 @@ class ChessLamp:
             for _ in range(pulse_count):
                 # Pulse up (brightness increase)
                 steps = 5
+                step_duration = pulse_duration / (steps * 2)
                 for i in range(steps):
                     current_brightness = int(brightness * (i + 1) / steps)
+                    step_start = time.monotonic()
                     self.set_lamp_color(color, brightness=current_brightness)
-                    time.sleep(pulse_duration / (steps * 2))
+                    sleep_until(step_start + step_duration)
                 
                 # Pulse down (brightness decrease)
                 for i in range(steps, 0, -1):
                     current_brightness = int(brightness * i / steps)
+                    step_start = time.monotonic()
                     self.set_lamp_color(color, brightness=current_brightness)
-                    time.sleep(pulse_duration / (steps * 2))
+                    sleep_until(step_start + step_duration)
                 
                 # Brief pause between pulses
                 if _ < pulse_count - 1:
                     time.sleep(0.1)
         except Exception as e:
-            print(f"⚠️  Error during pulse: {e}")
+            log.warning(f"⚠️  Error during pulse: {e}")
         finally:
             self._blinking_active = False
     
-    def handle_move_notification(self, game_data: Dict[str, Any]):
+    def handle_move_notification(self, game_data: Dict[str, Any], move_count: Optional[int] = None):
         """
         Detect new moves and flash the lamp.
         
         Args:
             game_data: Current game data
+            move_count: Move count already read from game_data, if the caller has it
         """
         if not self.move_notification_enabled:
             return
         
         try:
-            current_move_count = self.get_move_count(game_data)
+            current_move_count = move_count if move_count is not None else self.get_move_count(game_data)
             
             # Detect if a new move was made
             if current_move_count > self._last_move_count:
@@ -1238,38 +1949,73 @@ class ChessLamp:
                 move_delta = current_move_count - self._last_move_count
                 self._last_move_count = current_move_count
                 
-                # Flash for each new move (in case multiple moves happened)
-                for _ in range(min(move_delta, 3)):  # Max 3 flashes even if many moves
-                    if not self._blinking_active:
-                        # Quick flash - flash white briefly then return to current turn color
-                        print(f"💡 Move detected! Flashing notification...")
-                        # Flash white briefly
-                        self.set_lamp_color(self.move_notification_color, brightness=self.move_notification_brightness)
-                        time.sleep(self.move_notification_duration)
-                        # Return to appropriate turn color based on current game state
-                        # Determine whose turn it is from move count
-                        is_white_turn = (current_move_count % 2 == 0)
-                        if self.my_color == 'white':
-                            is_my_turn = is_white_turn
-                        elif self.my_color == 'black':
-                            is_my_turn = not is_white_turn
-                        else:
-                            # Fallback - use stored value
-                            is_my_turn = self.is_my_turn if self.is_my_turn is not None else True
-                        
-                        if is_my_turn:
-                            self.set_lamp_color(self.my_turn_color, brightness=self.my_turn_brightness)
-                        else:
-                            self.set_lamp_color(self.opponent_turn_color, brightness=self.opponent_turn_brightness)
-                        time.sleep(self.move_notification_duration * 0.5)  # Brief pause between flashes
+                # Flash for each new move (in case multiple moves happened) on the
+                # background worker, so the next game update isn't held up
+                self._background.submit(self._flash_moves, min(move_delta, 3))  # Max 3 flashes even if many moves
+        except Exception as e:
+            log.warning(f"⚠️  Error in move notification: {e}")
+    
+    def _flash_moves(self, flash_count: int):
+        """
+        Flash the move notification color, returning to the turn color after each flash.
+        
+        Args:
+            flash_count: Number of flashes
+        """
+        try:
+            for _ in range(flash_count):
+                if self._blinking_active or not self.current_game_id:
+                    continue
+                # Quick flash - flash white briefly then return to current turn color
+                log.debug("💡 Move detected! Flashing notification...")
+                # Flash white briefly (the send itself counts toward the flash)
+                flash_start = time.monotonic()
+                self.set_lamp_color(self.move_notification_color, brightness=self.move_notification_brightness)
+                sleep_until(flash_start + self.move_notification_duration)
+                # Return to the turn color as of now - the turn may have changed mid-flash
+                is_my_turn = self.is_my_turn if self.is_my_turn is not None else True
+                turn_color, turn_brightness, _ = self.turn_lamp_setting(is_my_turn)
+                self.set_lamp_color(turn_color, brightness=turn_brightness)
+                time.sleep(self.move_notification_duration * 0.5)  # Brief pause between flashes
         except Exception as e:
-            print(f"⚠️  Error in move notification: {e}")
+            log.warning(f"⚠️  Error in move notification: {e}")
+    
+    def _wait_for_lamp_effects(self, timeout: float = 10.0):
+        """Let background flashes/blinks finish so they can't land after a restore."""
+        try:
+            self._background.submit(lambda: None).result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            log.warning("⚠️  Lamp effects still running - continuing anyway")
+    
+    def _get_ongoing_games(self) -> tuple:
+        """
+        Get our ongoing games from Lichess.
+        Sends the last ETag so an unchanged list comes back as an empty 304
+        and the cached list is reused without parsing anything.
+        
+        Returns:
+            Tuple of (list of ongoing games, whether the list changed)
+        """
+        headers = {'If-None-Match': self._playing_etag} if self._playing_etag else None
+        response = self._lichess_call(self.lichess_session.get, LICHESS_PLAYING_URL, headers=headers, timeout=10)
+        if response.status_code == 304:
+            return self._playing_games, False
+        response.raise_for_status()
+        self._playing_games = json_loads(response.content).get('nowPlaying', [])
+        # Index once per changed list so the game loop's lookup is a dict get
+        self._playing_by_id = {}
+        for game in self._playing_games:
+            if isinstance(game, dict):
+                gid = game.get('gameId') or game.get('id')
+                if gid:
+                    self._playing_by_id.setdefault(gid, game)
+        self._playing_etag = response.headers.get('ETag')
+        return self._playing_games, True
     
     def get_current_game(self) -> Optional[Dict[str, Any]]:
         """Get the current ongoing game."""
         try:
-            # Get current games - berserk returns an iterator
-            games = list(self.lichess_client.games.get_ongoing())
+            games, _ = self._get_ongoing_games()
             if games:
                 # Return the first ongoing game
                 game = games[0]
@@ -1281,263 +2027,418 @@ class ChessLamp:
                 return {'gameId': str(game), 'full': game}
             return None
         except Exception as e:
-            print(f"Error getting current game: {e}")
+            log.warning(f"Error getting current game: {e}")
             return None
     
-    def determine_turn(self, game_data: Dict[str, Any]) -> Optional[bool]:
+    def wait_for_game_start(self, max_wait: float = 30.0) -> bool:
         """
-        Determine if it's the user's turn.
+        Block on the Lichess games-by-users stream until one of our games starts.
+        
+        Replaces the idle get_ongoing() poll: Lichess pushes a frame as soon as a
+        game involving us begins (and one per already-running game on connect).
         
         Args:
-            game_data: Game data from Lichess API (can be gameFull or gameState)
+            max_wait: Seconds of stream silence before giving up so the caller can
+                      hot-reload config and retry
             
         Returns:
-            True if it's the user's turn, False if opponent's turn, None if unknown
+            True if a new game started, False on timeout or stream error
         """
+        if not self._get_my_username():
+            return False
         try:
-            # Get the current player's username from the token
-            user_info = self.lichess_client.account.get()
-            my_username = user_info.get('username', '').lower()
-            
-            # Extract game state - might be nested in 'state' key for gameFull
-            if 'state' in game_data:
-                game_state = game_data['state']
-            else:
-                game_state = game_data
-            
-            # Get player info - might be in 'white'/'black' or 'players'
-            white_player = None
-            black_player = None
-            
-            if 'white' in game_data:
-                white_player = game_data['white'].get('name', '').lower() if isinstance(game_data['white'], dict) else str(game_data['white']).lower()
-            elif 'players' in game_data and 'white' in game_data['players']:
-                white_player = game_data['players']['white'].get('user', {}).get('name', '').lower()
-            
-            if 'black' in game_data:
-                black_player = game_data['black'].get('name', '').lower() if isinstance(game_data['black'], dict) else str(game_data['black']).lower()
-            elif 'players' in game_data and 'black' in game_data['players']:
-                black_player = game_data['players']['black'].get('user', {}).get('name', '').lower()
+            with self.lichess_session.post(
+                LICHESS_GAMES_BY_USERS_URL,
+                data=self.my_username,
+                params={'withCurrentGames': 'true'},
+                stream=True,
+                timeout=(5, max_wait),
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue  # keep-alive
+                    frame = json_loads(line)
+                    game_id = frame.get('id') or frame.get('gameId')
+                    status = frame.get('statusName', frame.get('status'))
+                    if game_id and game_id != self.current_game_id and status in ('started', 20):
+                        return True
+        except requests.exceptions.ReadTimeout:
+            return False
+        except Exception as e:
+            log.warning(f"⚠️  Game stream unavailable: {e}")
+            self._wait(2)
+        return False
+    
+    def _clock_seconds(self, value: Any) -> Optional[float]:
+        """Convert a stream clock value (millis, timedelta or datetime) to seconds."""
+        if value is None:
+            return None
+        if isinstance(value, (int, float)):
+            return value / 1000.0
+        if hasattr(value, 'total_seconds'):
+            return value.total_seconds()
+        if hasattr(value, 'timestamp'):
+            # berserk converts wtime/btime with datetime_from_millis
+            return value.timestamp()
+        return None
+    
+    def _apply_stream_state(self, current_game: Dict[str, Any], state: Dict[str, Any]):
+        """
+        Merge a gameState frame into the game snapshot used by the handlers.
+        
+        Args:
+            current_game: Snapshot built from the gameFull frame
+            state: gameState frame (or the 'state' of a gameFull frame)
+        """
+        # Moves are single-space separated and each frame repeats the whole game, so
+        # only the moves appended since the last frame need counting (a takeback
+        # or the first frame recounts from scratch)
+        moves = state.get('moves', '')
+        previous_moves = current_game.get('moves', '')
+        if previous_moves and moves.startswith(previous_moves):
+            ply_count = current_game['plyCount'] + moves.count(' ', len(previous_moves))
+        else:
+            ply_count = moves.count(' ') + 1 if moves else 0
+        current_game['moves'] = moves
+        current_game['plyCount'] = ply_count
+        # An odd number of plies means black is to move
+        current_game['isMyTurn'] = self._my_is_white ^ bool(ply_count & 1)
+        current_game['status'] = state.get('status', 'started')
+        
+        current_game['clock'] = {
+            'white': self._clock_seconds(state.get('wtime')),
+            'black': self._clock_seconds(state.get('btime'))
+        }
+        
+        # Stream reports the winner as a color - map it to the player so
+        # get_game_result can compare usernames like it does for polled games
+        winner_color = state.get('winner')
+        if winner_color in ('white', 'black'):
+            current_game['winner'] = current_game.get(winner_color) or {}
+        else:
+            current_game.pop('winner', None)
+    
+    def stream_game_state(self, game_id: str) -> bool:
+        """
+        Follow a game through the Board API NDJSON stream.
+        Turn changes are pushed by Lichess instead of polled.
+        
+        Args:
+            game_id: The ID of the game to monitor
             
-            # Determine whose turn it is from moves
-            moves = game_state.get('moves', '')
-            move_count = len(moves.split()) if moves else 0
+        Returns:
+            True if the game finished and was handled, False if the stream
+            closed before a final state was seen
+        """
+        self._get_my_username()
+        my_id = self.my_user_id
+        
+        stream = self.lichess_client.board.stream_game_state(game_id)
+        current_game = None
+        try:
+            for frame in stream:
+                if self._stop_event.is_set():
+                    break
+                frame_type = frame.get('type')
+                if frame_type == 'gameFull':
+                    white = frame.get('white') or {}
+                    black = frame.get('black') or {}
+                    if str(white.get('id', '')).lower() == my_id:
+                        color = 'white'
+                    elif str(black.get('id', '')).lower() == my_id:
+                        color = 'black'
+                    else:
+                        color = self.my_color
+                    self._my_is_white = color == 'white'
+                    current_game = {
+                        'gameId': game_id,
+                        'color': color,
+                        'white': white,
+                        'black': black,
+                        'players': {
+                            'white': {'connected': True},
+                            'black': {'connected': True}
+                        }
+                    }
+                    state = frame.get('state') or {}
+                    self._apply_stream_state(current_game, state)
+                    # Don't flash for moves made before we started watching
+                    self._last_move_count = self.get_move_count(current_game)
+                elif frame_type == 'gameState' and current_game is not None:
+                    self._apply_stream_state(current_game, frame)
+                elif frame_type == 'opponentGone' and current_game is not None:
+                    opponent_color = 'black' if current_game.get('color') == 'white' else 'white'
+                    current_game['players'][opponent_color]['connected'] = not frame.get('gone', False)
+                else:
+                    continue  # chatLine and other frames don't affect the lamp
+                
+                # Check for config changes (hot reload) on every pushed update
+                self.reload_theme_from_config()
+                
+                if self._process_game_update(game_id, current_game):
+                    return True
+            return False
+        finally:
+            # Close the stream so the HTTP connection isn't left dangling
+            stream.close()
+    
+    def _handle_game_gone(self, game_id: str):
+        """Restore the lamp when a game disappears from the ongoing list."""
+        log.info(f"Game {game_id} no longer found (game ended or not ongoing)")
+        self._wait_for_lamp_effects()
+        # Only restore if enabled - if disabled, leave lamp as-is
+        if self.enabled:
+            log.info("Game over - Restoring lamp to previous state...")
+            if self.pre_game_state:
+                log.info(f"Previous state: {self.pre_game_state}")
+            restored = self.restore_lamp_state(self.pre_game_state)
+            if not restored:
+                log.warning("⚠️  State restoration may have failed - check logs above")
+        else:
+            log.warning("⚠️  Chess-lamp is disabled - skipping lamp restore")
+        self._abandonment_handled = False
+        self.current_game_id = None
+        self.pre_game_state = None
+        self._last_move_count = 0  # Reset move count tracking
+    
+    def _observe(self, current_game: Dict[str, Any]) -> GameObservation:
+        """
+        Read the fields the update handler needs from a game snapshot.
+        
+        Args:
+            current_game: Game data (ongoing-games entry or stream snapshot)
             
-            # Even number of moves = white's turn, odd = black's turn
-            is_white_turn = (move_count % 2 == 0)
+        Returns:
+            GameObservation for this snapshot
+        """
+        status = current_game.get('status', {})
+        status_name = status.get('name', '') if isinstance(status, dict) else str(status)
+        
+        winner = current_game.get('winner')
+        
+        # Player connection status, if the snapshot has it
+        opponent = (current_game.get('players') or {}).get(self._opponent_color)
+        opponent_connected = opponent.get('connected', True) if isinstance(opponent, dict) else True
+        
+        return GameObservation(
+            status_name=status_name,
+            is_my_turn=current_game.get('isMyTurn', False),
+            winner_name=player_name(winner) if winner else None,
+            opponent_connected=opponent_connected,
+            move_count=self.get_move_count(current_game)
+        )
+    
+    def _process_game_update(self, game_id: str, current_game: Dict[str, Any]) -> bool:
+        """
+        React to a new snapshot of the monitored game.
+        
+        Args:
+            game_id: The ID of the game being monitored
+            current_game: Game data (ongoing-games entry or stream snapshot)
             
-            # Determine which color the user is playing
-            if white_player and white_player == my_username:
-                self.my_color = 'white'
-                return is_white_turn
-            elif black_player and black_player == my_username:
-                self.my_color = 'black'
-                return not is_white_turn
+        Returns:
+            True if the game is over and monitoring should stop
+        """
+        observation = self._observe(current_game)
+        is_my_turn = observation.is_my_turn
+        status_name = observation.status_name
+        
+        # Check for opponent abandonment/disconnection
+        opponent_abandoned = False
+        if status_name in self._TIMEOUT_STATUSES:
+            # Check if it was the opponent who timed out (not us)
+            # If there's a winner and it's us, opponent abandoned
+            if observation.winner_name and observation.winner_name == self._get_my_username():
+                opponent_abandoned = True
+                log.warning("⚠️  Opponent left/disconnected without resigning!")
+        
+        # Also check for 'abandoned' status
+        if status_name == 'abandoned':
+            opponent_abandoned = True
+            log.warning("⚠️  Opponent abandoned the game!")
+        
+        # Opponent is disconnected and it's their turn
+        if not observation.opponent_connected and not is_my_turn:
+            log.warning("⚠️  Opponent appears to be disconnected!")
+            opponent_abandoned = True
+        
+        # If opponent abandoned, reduce brightness by half
+        if opponent_abandoned and not self._abandonment_handled:
+            log.warning("⚠️  Opponent left - Reducing brightness by half...")
+            # Get current color (should be red if opponent's turn, green if our turn)
+            current_color, current_brightness, _ = self.turn_lamp_setting(is_my_turn)
+            # Reduce brightness by half
+            reduced_brightness = max(1, current_brightness // 2)  # At least 1% brightness
+            log.info(f"Setting lamp to {current_color} at {reduced_brightness}% brightness (half of {current_brightness}%)")
+            self.queue_lamp_color(current_color, brightness=reduced_brightness)
+            self._abandonment_handled = True  # Mark as handled so we don't do it multiple times
+        
+        if status_name in self._TERMINAL_STATUSES:
+            self._wait_for_lamp_effects()
+            # Determine game result and celebrate
+            game_result = self.get_game_result(current_game)
+            if game_result:
+                self.celebrate_game_result(game_result)
+                # Longer pause after celebration so it's visible
+                log.info("Waiting before restoring lamp state...")
+                time.sleep(2.0)  # 2 second delay to see the celebration
             
-            return None
-        except Exception as e:
-            print(f"Error determining turn: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+            if opponent_abandoned:
+                log.info("Game ended - Opponent left/disconnected. Restoring lamp to previous state...")
+            else:
+                log.info("Game is over! Restoring lamp to previous state...")
+            # Only restore if enabled - if disabled, leave lamp as-is
+            if self.enabled:
+                if self.pre_game_state:
+                    log.info(f"Previous state: {self.pre_game_state}")
+                restored = self.restore_lamp_state(self.pre_game_state)
+                if not restored:
+                    log.warning("⚠️  State restoration may have failed - check logs above")
+            else:
+                log.warning("⚠️  Chess-lamp is disabled - skipping lamp restore")
+            # Clean up abandonment flag
+            self._abandonment_handled = False
+            self.current_game_id = None
+            self.pre_game_state = None
+            return True
+        
+        # Determine which color we're playing (if not already set)
+        if self.my_color is None:
+            self.my_color = self._infer_my_color(current_game)
+            if self.my_color:
+                log.info(f"You are playing {self.my_color.upper()}")
+        
+        # Update lamp based on whose turn it is (green for my turn, red for opponent)
+        if is_my_turn != self.is_my_turn:
+            self.is_my_turn = is_my_turn
+            if not self.enabled:
+                log.warning("⚠️  Chess-lamp is disabled - skipping lamp update")
+            else:
+                self.show_turn(is_my_turn)
+        
+        # Check for time pressure (only when it's our turn)
+        if is_my_turn and self.time_pressure_enabled:
+            self.handle_time_pressure(current_game, is_my_turn)
+        
+        # Check for check (only when it's our turn)
+        if is_my_turn and self.check_enabled:
+            self.handle_check(current_game, is_my_turn)
+        
+        # Check for move notifications (any move, any turn)
+        if self.move_notification_enabled:
+            self.handle_move_notification(current_game, observation.move_count)
+        
+        return False
+    
+    def stop(self):
+        """Ask the monitor loops to exit at their next wait."""
+        self._stop_event.set()
+    
+    def close(self):
+        """Stop monitoring and release the worker threads, LAN socket and event loop."""
+        self.stop()
+        for pool in (self._background, self._lamp_io, self._cloud_io):
+            pool.shutdown(wait=False)
+        if self.lan_controller is not None:
+            self.lan_controller.close()
+        loop = self._async_loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+    
+    def _wait(self, seconds: float) -> bool:
+        """
+        Sleep between polls/retries, waking early if stop() is called.
+        
+        Returns:
+            True if monitoring should stop
+        """
+        return self._stop_event.wait(seconds)
     
     def monitor_game_state(self, game_id: str):
         """
-        Monitor a specific game by polling its state.
-        Regular games can't use Board API streaming, so we poll instead.
+        Monitor a specific game.
+        Streams the game via the Board API; games the Board API can't stream
+        (or a dropped stream) fall back to polling the ongoing games list.
         
         Args:
             game_id: The ID of the game to monitor
         """
         try:
-            print(f"Monitoring game {game_id}")
+            log.info(f"Monitoring game {game_id}")
             
-            while True:
+            for attempt, delay in enumerate((0.0,) + STREAM_RECONNECT_DELAYS):
+                if delay:
+                    if self._wait(delay):
+                        return
+                    log.info(f"🔄 Reconnecting game stream (attempt {attempt}/{len(STREAM_RECONNECT_DELAYS)})...")
                 try:
-                    # Check for config changes (hot reload) - check periodically during game
-                    self.reload_theme_from_config()
-                    
-                    # Get current game state
-                    games = list(self.lichess_client.games.get_ongoing())
-                    current_game = None
-                    for game in games:
-                        if isinstance(game, dict):
-                            gid = game.get('gameId') or game.get('id')
-                            if gid == game_id:
-                                current_game = game
-                                break
-                    
-                    if not current_game:
-                        print(f"Game {game_id} no longer found (game ended or not ongoing)")
-                        # Only restore if enabled - if disabled, leave lamp as-is
-                        if self.enabled:
-                            print("Game over - Restoring lamp to previous state...")
-                            if self.pre_game_state:
-                                print(f"Previous state: {self.pre_game_state}")
-                            restored = self.restore_lamp_state(self.pre_game_state)
-                            if not restored:
-                                print("⚠️  State restoration may have failed - check logs above")
-                        else:
-                            print("⚠️  Chess-lamp is disabled - skipping lamp restore")
-                        self.current_game_id = None
-                        self.pre_game_state = None
-                        self._last_move_count = 0  # Reset move count tracking
-                        break
-                    
-                    # Get whose turn it is - the API provides this directly!
-                    is_my_turn = current_game.get('isMyTurn', False)
-                    
-                    # Check game status
-                    status = current_game.get('status', {})
-                    if isinstance(status, dict):
-                        status_name = status.get('name', '')
-                    else:
-                        status_name = str(status)
-                    
-                    # Check for opponent abandonment/disconnection
-                    opponent_abandoned = False
-                    if status_name in ['timeout', 'outoftime']:
-                        # Check if it was the opponent who timed out (not us)
-                        winner = current_game.get('winner')
-                        if winner:
-                            # If there's a winner and it's not us, opponent abandoned
-                            user_info = self.lichess_client.account.get()
-                            my_username = user_info.get('username', '').lower()
-                            winner_username = winner.get('name', '').lower() if isinstance(winner, dict) else str(winner).lower()
-                            if winner_username == my_username:
-                                opponent_abandoned = True
-                                print("⚠️  Opponent left/disconnected without resigning!")
-                    
-                    # Also check for 'abandoned' status
-                    if status_name == 'abandoned':
-                        opponent_abandoned = True
-                        print("⚠️  Opponent abandoned the game!")
-                    
-                    # Check player connection status if available
-                    if 'players' in current_game:
-                        players = current_game.get('players', {})
-                        opponent_color = 'black' if self.my_color == 'white' else 'white'
-                        opponent_data = players.get(opponent_color, {})
-                        if isinstance(opponent_data, dict):
-                            # Check if opponent is connected/active
-                            is_connected = opponent_data.get('connected', True)
-                            if not is_connected and not is_my_turn:
-                                # Opponent is disconnected and it's their turn
-                                print("⚠️  Opponent appears to be disconnected!")
-                                opponent_abandoned = True
-                    
-                    # If opponent abandoned, reduce brightness by half
-                    if opponent_abandoned and not hasattr(self, '_abandonment_handled'):
-                        print("⚠️  Opponent left - Reducing brightness by half...")
-                        # Get current color (should be red if opponent's turn, green if our turn)
-                        current_color = self.opponent_turn_color if not is_my_turn else self.my_turn_color
-                        current_brightness = self.opponent_turn_brightness if not is_my_turn else self.my_turn_brightness
-                        # Reduce brightness by half
-                        reduced_brightness = max(1, current_brightness // 2)  # At least 1% brightness
-                        print(f"Setting lamp to {current_color} at {reduced_brightness}% brightness (half of {current_brightness}%)")
-                        self.set_lamp_color(current_color, brightness=reduced_brightness)
-                        self._abandonment_handled = True  # Mark as handled so we don't do it multiple times
-                        # Wait a moment before continuing
-                        time.sleep(2)
-                    
-                    if status_name in ['mate', 'resign', 'draw', 'stalemate', 'timeout', 'outoftime', 'cheat', 'abandoned']:
-                        # Determine game result and celebrate
-                        game_result = self.get_game_result(current_game)
-                        if game_result:
-                            self.celebrate_game_result(game_result)
-                            # Longer pause after celebration so it's visible
-                            print("Waiting before restoring lamp state...")
-                            time.sleep(2.0)  # 2 second delay to see the celebration
-                        
-                        if opponent_abandoned:
-                            print("Game ended - Opponent left/disconnected. Restoring lamp to previous state...")
-                        else:
-                            print("Game is over! Restoring lamp to previous state...")
-                        # Only restore if enabled - if disabled, leave lamp as-is
-                        if self.enabled:
-                            if self.pre_game_state:
-                                print(f"Previous state: {self.pre_game_state}")
-                            restored = self.restore_lamp_state(self.pre_game_state)
-                            if not restored:
-                                print("⚠️  State restoration may have failed - check logs above")
-                        else:
-                            print("⚠️  Chess-lamp is disabled - skipping lamp restore")
-                        # Clean up abandonment flag
-                        if hasattr(self, '_abandonment_handled'):
-                            delattr(self, '_abandonment_handled')
-                        self.current_game_id = None
-                        self.pre_game_state = None
-                        break
-                    
-                    # Determine which color we're playing (if not already set)
-                    # The game data has a 'color' field that directly tells us!
-                    if self.my_color is None:
-                        my_color_from_game = current_game.get('color')
-                        if my_color_from_game:
-                            self.my_color = my_color_from_game.lower()
-                            print(f"You are playing {self.my_color.upper()}")
-                        else:
-                            # Fallback: try to determine from white/black fields
-                            user_info = self.lichess_client.account.get()
-                            my_username = user_info.get('username', '').lower()
-                            
-                            white_player = None
-                            black_player = None
-                            if 'white' in current_game:
-                                white_player = current_game['white'].get('name', '').lower() if isinstance(current_game['white'], dict) else str(current_game['white']).lower()
-                            if 'black' in current_game:
-                                black_player = current_game['black'].get('name', '').lower() if isinstance(current_game['black'], dict) else str(current_game['black']).lower()
-                            
-                            if white_player == my_username:
-                                self.my_color = 'white'
-                                print(f"You are playing WHITE")
-                            elif black_player == my_username:
-                                self.my_color = 'black'
-                                print(f"You are playing BLACK")
-                    
-                    # Update lamp based on whose turn it is (green for my turn, red for opponent)
-                    if is_my_turn != self.is_my_turn:
-                        self.is_my_turn = is_my_turn
-                        if not self.enabled:
-                            print("⚠️  Chess-lamp is disabled - skipping lamp update")
-                        else:
-                            if is_my_turn:
-                                print(f"It's your turn! - Setting {self.my_turn_color} at {self.my_turn_brightness}% brightness")
-                                self.set_lamp_color(self.my_turn_color, brightness=self.my_turn_brightness, gradual_dim=self.gradual_dim_enabled, dim_duration=self.gradual_dim_duration)
-                            else:
-                                print(f"Opponent's turn - Setting {self.opponent_turn_color} at {self.opponent_turn_brightness}% brightness")
-                                self.set_lamp_color(self.opponent_turn_color, brightness=self.opponent_turn_brightness, gradual_dim=self.gradual_dim_enabled, dim_duration=self.gradual_dim_duration)
-                    
-                    # Check for time pressure (only when it's our turn)
-                    if is_my_turn:
-                        self.handle_time_pressure(current_game, is_my_turn)
-                    
-                    # Check for check (only when it's our turn)
-                    if is_my_turn:
-                        self.handle_check(current_game, is_my_turn)
-                    
-                    # Check for move notifications (any move, any turn)
-                    self.handle_move_notification(current_game)
-                    
-                    # Poll every 0.8 seconds for faster response (with rate limit handling)
-                    time.sleep(0.8)
-                    
+                    if self.stream_game_state(game_id):
+                        return
+                    log.warning("⚠️  Game stream closed before the game ended")
                 except KeyboardInterrupt:
-                    print("\nStopping game monitor...")
-                    break
+                    log.info("Stopping game monitor...")
+                    return
                 except Exception as e:
-                    error_str = str(e)
-                    if '429' in error_str or 'Too Many Requests' in error_str:
-                        print(f"⚠️  Rate limited - waiting longer before retry...")
-                        time.sleep(5)  # Wait when rate limited, but not too long
-                    else:
-                        print(f"Error monitoring game: {e}")
-                        time.sleep(1)  # Shorter error delay
+                    log.warning(f"⚠️  Game stream unavailable ({e})")
+                    # Client errors (e.g. token without board:play) won't fix themselves
+                    if is_permanent_client_error(e):
+                        break
+            
+            if self._stop_event.is_set():
+                return
+            log.warning("⚠️  Falling back to polling")
+            self.poll_game_state(game_id)
         
         except Exception as e:
-            print(f"Error in game monitor: {e}")
-            import traceback
-            traceback.print_exc()
+            log.error(f"Error in game monitor: {e}")
+            log.debug("Game monitor failed", exc_info=True)
+    
+    def poll_game_state(self, game_id: str):
+        """
+        Monitor a specific game by polling its state.
+        Used when the game can't be followed through the Board API stream.
+        
+        Args:
+            game_id: The ID of the game to monitor
+        """
+        failures = 0
+        processed = False
+        while not self._stop_event.is_set():
+            try:
+                # Check for config changes (hot reload) - check periodically during game
+                self.reload_theme_from_config()
+                
+                # Get current game state - nothing to do if Lichess says it hasn't changed
+                _, changed = self._get_ongoing_games()
+                if processed and not changed:
+                    self._wait(0.8)
+                    continue
+                current_game = self._playing_by_id.get(game_id)
+                
+                if not current_game:
+                    self._handle_game_gone(game_id)
+                    break
+                
+                if self._process_game_update(game_id, current_game):
+                    break
+                processed = True
+                
+                failures = 0
+                # Poll every 0.8 seconds for faster response (with rate limit handling)
+                self._wait(0.8)
+                
+            except KeyboardInterrupt:
+                log.info("Stopping game monitor...")
+                break
+            except Exception as e:
+                delay = retry_delay(e, failures)
+                failures += 1
+                if http_status(e) == 429:
+                    log.warning(f"⚠️  Rate limited - waiting {delay:.1f}s before retry...")
+                else:
+                    log.error(f"Error monitoring game: {e}")
+                self._wait(delay)
     
     def reload_theme_from_config(self):
         """Reload theme and color settings from config.json if it changed."""
@@ -1553,8 +2454,8 @@ class ChessLamp:
             self._config_last_modified = current_mtime
             
             # Load config
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
+            with open(self.config_path, 'rb') as f:
+                config = json_loads(f.read())
             
             # Get theme or individual colors
             theme = config.get('theme')
@@ -1599,129 +2500,166 @@ class ChessLamp:
                 changed = True
             
             if changed:
-                print(f"🔄 Config reloaded! Theme: {theme or 'custom'}, Colors: {self.my_turn_color}/{self.opponent_turn_color}, Brightness: {self.my_turn_brightness}%/{self.opponent_turn_brightness}%")
+                self._prime_cloud_payloads()
+                log.info(f"🔄 Config reloaded! Theme: {theme or 'custom'}, Colors: {self.my_turn_color}/{self.opponent_turn_color}, Brightness: {self.my_turn_brightness}%/{self.opponent_turn_brightness}%")
                 return True
             
             return False
         except Exception as e:
-            print(f"⚠️  Error reloading config: {e}")
+            log.warning(f"⚠️  Error reloading config: {e}")
             return False
     
+    def start_game(self, game_id: str, game_data: Optional[Dict[str, Any]]):
+        """
+        Set up the lamp for a newly found game and monitor it until it ends.
+        
+        Args:
+            game_id: The ID of the game
+            game_data: Game summary from Lichess (gameStart event or ongoing-games entry)
+        """
+        # Found new game - set color immediately for fast response
+        log.info(f"Found new game: {game_id}")
+        self.current_game_id = game_id
+        self._last_move_count = 0  # Reset move count for new game
+        self._abandonment_handled = False
+        
+        # Skip if disabled
+        if not self.enabled:
+            log.warning("⚠️  Chess-lamp is disabled - skipping lamp updates")
+            return
+        
+        # Initialize turn state from current game data
+        if isinstance(game_data, dict):
+            is_my_turn = game_data.get('isMyTurn', False)
+            self.is_my_turn = is_my_turn
+            
+            # Determine which color we're playing
+            my_color = self._infer_my_color(game_data)
+            if my_color:
+                self.my_color = my_color
+                log.info(f"Game started - You are playing {self.my_color.upper()}")
+                # Set color IMMEDIATELY for fast response
+                self.show_turn(is_my_turn)
+        
+        # Save state in background (non-blocking) - use timeout to avoid delay
+        log.info("Saving current lamp state (non-blocking)...")
+        self._background.submit(self._save_pre_game_state)
+        
+        self.monitor_game_state(game_id)
+    
+    def _save_pre_game_state(self):
+        """Remember the lamp state from before the game so it can be restored afterwards."""
+        try:
+            self.pre_game_state = self.get_lamp_state()
+            if self.pre_game_state:
+                log.info("✅ Lamp state saved - will restore when game ends")
+            else:
+                log.warning("⚠️  Could not get lamp state - lamp will remain as-is when game ends")
+        except:
+            pass  # Don't block on state save
+    
+    def stream_incoming_events(self):
+        """
+        Follow the Lichess event stream and monitor each game as it starts.
+        Lichess sends a gameStart event for games already in progress on connect,
+        then one per new game. Returns when the stream closes.
+        """
+        stream = self.lichess_client.board.stream_incoming_events()
+        try:
+            for event in stream:
+                if self._stop_event.is_set():
+                    break
+                if event.get('type') != 'gameStart':
+                    continue  # gameFinish, challenges, etc. - the game monitor handles endings
+                
+                # Check for config changes (hot reload)
+                self.reload_theme_from_config()
+                
+                game = event.get('game') or {}
+                game_id = game.get('gameId') or game.get('id')
+                if game_id and game_id != self.current_game_id:
+                    self.start_game(game_id, game)
+        finally:
+            # Close the stream so the HTTP connection isn't left dangling
+            stream.close()
+    
     def monitor_games(self):
         """Monitor for ongoing games and stream events."""
-        print("Monitoring for Lichess games...")
-        print("Start a game on Lichess to begin!")
-        print("💡 Tip: Edit config.json to change themes without restarting!")
+        log.info("Monitoring for Lichess games...")
+        log.info("Start a game on Lichess to begin!")
+        log.info("💡 Tip: Edit config.json to change themes without restarting!")
         
         # Initialize config file modification time
         if os.path.exists(self.config_path):
             self._config_last_modified = os.path.getmtime(self.config_path)
         
-        while True:
+        # New games are pushed on the event stream; tokens that can't open it
+        # fall back to looking for games in the ongoing list
+        use_event_stream = True
+        stream_failures = 0
+        
+        while not self._stop_event.is_set():
             try:
                 # Check for config changes (hot reload)
                 self.reload_theme_from_config()
                 
+                if use_event_stream:
+                    try:
+                        self.stream_incoming_events()
+                        stream_failures = 0
+                        log.warning("⚠️  Event stream closed - reconnecting...")
+                        self._wait(1)
+                        continue
+                    except KeyboardInterrupt:
+                        raise
+                    except Exception as e:
+                        if is_permanent_client_error(e):
+                            log.warning(f"⚠️  Event stream unavailable ({e}) - watching the ongoing games list instead")
+                            use_event_stream = False
+                        else:
+                            # Back off while Lichess (or the network) stays unavailable
+                            delay = retry_delay(e, stream_failures, base=2.0)
+                            stream_failures += 1
+                            log.warning(f"⚠️  Event stream error: {e} - reconnecting in {delay:.0f}s")
+                            self._wait(delay)
+                            continue
+                
                 # Check for ongoing games
                 game = self.get_current_game()
                 
                 if game and game.get('gameId') != self.current_game_id:
-                    # Found new game - set color immediately for fast response
-                    print(f"Found new game: {game.get('gameId')}")
-                    self.current_game_id = game.get('gameId')
-                    self._last_move_count = 0  # Reset move count for new game
-                    
-                    # Skip if disabled
-                    if not self.enabled:
-                        print("⚠️  Chess-lamp is disabled - skipping lamp updates")
-                        time.sleep(2)
-                        continue
-                    
-                    # Initialize turn state from current game data
-                    if isinstance(game.get('full'), dict):
-                        game_data = game.get('full')
-                        is_my_turn = game_data.get('isMyTurn', False)
-                        self.is_my_turn = is_my_turn
-                        
-                        # Determine which color we're playing - use 'color' field from game data
-                        my_color_from_game = game_data.get('color')
-                        if my_color_from_game:
-                            self.my_color = my_color_from_game.lower()
-                            print(f"Game started - You are playing {self.my_color.upper()}")
-                            # Set color IMMEDIATELY for fast response
-                            if is_my_turn:
-                                print(f"It's your turn! - Setting {self.my_turn_color}")
-                                self.set_lamp_color(self.my_turn_color, brightness=self.my_turn_brightness, gradual_dim=self.gradual_dim_enabled, dim_duration=self.gradual_dim_duration)
-                            else:
-                                print(f"Opponent's turn - Setting {self.opponent_turn_color}")
-                                self.set_lamp_color(self.opponent_turn_color, brightness=self.opponent_turn_brightness, gradual_dim=self.gradual_dim_enabled, dim_duration=self.gradual_dim_duration)
-                        else:
-                            # Fallback: try to determine from white/black fields
-                            user_info = self.lichess_client.account.get()
-                            my_username = user_info.get('username', '').lower()
-                            
-                            white_player = None
-                            black_player = None
-                            if 'white' in game_data:
-                                white_player = game_data['white'].get('name', '').lower() if isinstance(game_data['white'], dict) else str(game_data['white']).lower()
-                            if 'black' in game_data:
-                                black_player = game_data['black'].get('name', '').lower() if isinstance(game_data['black'], dict) else str(game_data['black']).lower()
-                            
-                            if white_player == my_username:
-                                self.my_color = 'white'
-                                print(f"Game started - You are playing WHITE")
-                                if is_my_turn:
-                                    print("It's your turn! - Setting GREEN")
-                                    self.set_lamp_color(self.my_turn_color, brightness=self.my_turn_brightness, gradual_dim=self.gradual_dim_enabled, dim_duration=self.gradual_dim_duration)
-                                else:
-                                    print("Opponent's turn - Setting RED")
-                                    self.set_lamp_color(self.opponent_turn_color, brightness=self.opponent_turn_brightness, gradual_dim=self.gradual_dim_enabled, dim_duration=self.gradual_dim_duration)
-                            elif black_player == my_username:
-                                self.my_color = 'black'
-                                print(f"Game started - You are playing BLACK")
-                                if is_my_turn:
-                                    print("It's your turn! - Setting GREEN")
-                                    self.set_lamp_color(self.my_turn_color, brightness=self.my_turn_brightness, gradual_dim=self.gradual_dim_enabled, dim_duration=self.gradual_dim_duration)
-                                else:
-                                    print("Opponent's turn - Setting RED")
-                                    self.set_lamp_color(self.opponent_turn_color, brightness=self.opponent_turn_brightness, gradual_dim=self.gradual_dim_enabled, dim_duration=self.gradual_dim_duration)
-                    
-                    # Save state in background (non-blocking) - use timeout to avoid delay
-                    print("Saving current lamp state (non-blocking)...")
-                    import threading
-                    def save_state():
-                        try:
-                            self.pre_game_state = self.get_lamp_state()
-                            if self.pre_game_state:
-                                print("✅ Lamp state saved - will restore when game ends")
-                            else:
-                                print("⚠️  Could not get lamp state - lamp will remain as-is when game ends")
-                        except:
-                            pass  # Don't block on state save
-                    threading.Thread(target=save_state, daemon=True).start()
-                    
-                    self.monitor_game_state(self.current_game_id)
+                    self.start_game(game.get('gameId'), game.get('full'))
                 else:
-                    # No game or same game, check more frequently
-                    time.sleep(2)  # Reduced from 5s to 2s for faster game detection
+                    # No game or same game - wait for Lichess to push the next game start
+                    self.wait_for_game_start()
             
             except KeyboardInterrupt:
-                print("\nStopping monitor...")
+                log.info("Stopping monitor...")
                 break
             except Exception as e:
-                print(f"Error in monitor loop: {e}")
-                time.sleep(2)  # Reduced from 5s to 2s
+                log.error(f"Error in monitor loop: {e}")
+                self._wait(2)  # Reduced from 5s to 2s
 
 
 def load_config() -> Dict[str, str]:
-    """Load configuration from config.json or environment variables."""
+    """
+    Load configuration from config.json or environment variables.
+    The file is read once per process, so edits to it need a restart (theme
+    and color settings are hot-reloaded separately by reload_theme_from_config).
+    Each call returns its own copy, safe for the caller to modify.
+    """
+    return copy.deepcopy(_read_config())
+
+
+@functools.lru_cache(maxsize=1)
+def _read_config() -> Dict[str, str]:
+    """Read config.json (or the environment) once - see load_config."""
     config = {}
     
     # Try to load from config.json
-    config_path = os.path.join(os.path.dirname(__file__), 'config.json')
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+    if os.path.exists(CONFIG_PATH):
+        with open(CONFIG_PATH, 'rb') as f:
+            config = json_loads(f.read())
     else:
         # Fall back to environment variables
         config = {
@@ -1736,9 +2674,20 @@ def load_config() -> Dict[str, str]:
 
 def main():
     """Main entry point."""
-    print("=" * 50)
-    print("Chess Lamp")
-    print("=" * 50)
+    # CHESS_LAMP_LOG sets the log level (e.g. DEBUG for troubleshooting, WARNING for quiet)
+    log_level = getattr(logging, os.getenv('CHESS_LAMP_LOG', 'INFO').upper(), logging.INFO)
+    # Callers only enqueue records - formatting and the stdout write happen on the
+    # listener's thread, so logging never blocks a lamp flash on terminal I/O
+    console = logging.StreamHandler(sys.stdout)
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, console)
+    listener.start()
+    atexit.register(listener.stop)
+    logging.basicConfig(level=log_level, format='%(message)s', handlers=[logging.handlers.QueueHandler(log_queue)])
+    
+    log.info("=" * 50)
+    log.info("Chess Lamp")
+    log.info("=" * 50)
     
     # Load configuration
     config = load_config()
@@ -1748,10 +2697,10 @@ def main():
     missing_keys = [key for key in required_keys if not config.get(key)]
     
     if missing_keys:
-        print(f"Error: Missing required configuration: {', '.join(missing_keys)}")
-        print("\nPlease set these in config.json or as environment variables:")
+        log.error(f"Error: Missing required configuration: {', '.join(missing_keys)}")
+        log.info("Please set these in config.json or as environment variables:")
         for key in missing_keys:
-            print(f"  - {key.upper()}")
+            log.info(f"  - {key.upper()}")
         sys.exit(1)
     
     # Create integration instance
@@ -1763,19 +2712,10 @@ def main():
         # Support both hex string and RGB dict formats
         if isinstance(restore_color_value, str):
             # Hex format: "#FFC864" or "FFC864"
-            hex_str = restore_color_value.lstrip('#')
-            if len(hex_str) == 6:
-                try:
-                    restore_color = {
-                        'r': int(hex_str[0:2], 16),
-                        'g': int(hex_str[2:4], 16),
-                        'b': int(hex_str[4:6], 16)
-                    }
-                except ValueError:
-                    print(f"⚠️  Invalid hex color format: {restore_color_value}, using default")
-                    restore_color = None
-            else:
-                print(f"⚠️  Invalid hex color format: {restore_color_value}, using default")
+            try:
+                restore_color = hex_to_rgb(restore_color_value)
+            except ValueError:
+                log.warning(f"⚠️  Invalid hex color format: {restore_color_value}, using default")
                 restore_color = None
         elif isinstance(restore_color_value, dict):
             # RGB dict format: {"r": 255, "g": 200, "b": 100}
@@ -1862,11 +2802,14 @@ def main():
     if FLASK_AVAILABLE:
         api_thread = threading.Thread(target=lambda: start_api_server(integration), daemon=True)
         api_thread.start()
-        print("🌐 API server started on http://0.0.0.0:5000")
-        print("   Mobile app can connect to control themes and settings!")
+        log.info("🌐 API server started on http://0.0.0.0:5000")
+        log.info("   Mobile app can connect to control themes and settings!")
     
     # Start monitoring
-    integration.monitor_games()
+    try:
+        integration.monitor_games()
+    finally:
+        integration.close()
 
 
 def start_api_server(chess_lamp_instance: ChessLamp):
@@ -1925,19 +2868,19 @@ def start_api_server(chess_lamp_instance: ChessLamp):
         try:
             config_path = chess_lamp_instance.config_path
             if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
+                with open(config_path, 'rb') as f:
+                    config = json_loads(f.read())
                 config['theme'] = theme_name
                 with open(config_path, 'w') as f:
                     json.dump(config, f, indent=2)
         except Exception as e:
-            print(f"⚠️  Could not update config.json: {e}")
+            log.warning(f"⚠️  Could not update config.json: {e}")
         
         # Immediately apply the new theme colors if a game is active
         if chess_lamp_instance.current_game_id and chess_lamp_instance.is_my_turn is not None:
             if chess_lamp_instance.enabled:
                 if chess_lamp_instance.is_my_turn:
-                    print(f"🎨 Applying new theme immediately (your turn): {theme['name']}")
+                    log.info(f"🎨 Applying new theme immediately (your turn): {theme['name']}")
                     chess_lamp_instance.set_lamp_color(
                         chess_lamp_instance.my_turn_color,
                         brightness=chess_lamp_instance.my_turn_brightness,
@@ -1945,7 +2888,7 @@ def start_api_server(chess_lamp_instance: ChessLamp):
                         dim_duration=chess_lamp_instance.gradual_dim_duration
                     )
                 else:
-                    print(f"🎨 Applying new theme immediately (opponent's turn): {theme['name']}")
+                    log.info(f"🎨 Applying new theme immediately (opponent's turn): {theme['name']}")
                     chess_lamp_instance.set_lamp_color(
                         chess_lamp_instance.opponent_turn_color,
                         brightness=chess_lamp_instance.opponent_turn_brightness,
@@ -1953,7 +2896,7 @@ def start_api_server(chess_lamp_instance: ChessLamp):
                         dim_duration=chess_lamp_instance.gradual_dim_duration
                     )
         
-        print(f"🎨 Theme changed via API: {theme['name']}")
+        log.info(f"🎨 Theme changed via API: {theme['name']}")
         return jsonify({'success': True, 'theme': theme_name, 'name': theme['name']})
     
     @app.route('/api/brightness', methods=['POST'])
@@ -1992,37 +2935,37 @@ def start_api_server(chess_lamp_instance: ChessLamp):
             
             # If disabling, restore lamp to pre-game state or default
             if not new_enabled_state and was_enabled:
-                print("🔌 Disabling chess-lamp - restoring lamp to previous state...")
+                log.info("🔌 Disabling chess-lamp - restoring lamp to previous state...")
                 
                 # Try to restore pre-game state if we have it
                 restored = False
                 if chess_lamp_instance.pre_game_state:
-                    print("Attempting to restore to saved pre-game state...")
+                    log.info("Attempting to restore to saved pre-game state...")
                     restored = chess_lamp_instance.restore_lamp_state(chess_lamp_instance.pre_game_state)
                 
                 # Always fallback to default restore color to ensure lamp is restored
                 if not restored:
-                    print(f"🔌 Restoring to default color: {chess_lamp_instance.default_restore_color} at {chess_lamp_instance.default_restore_brightness}%")
+                    log.info(f"🔌 Restoring to default color: {chess_lamp_instance.default_restore_color} at {chess_lamp_instance.default_restore_brightness}%")
                     success = chess_lamp_instance.set_lamp_color(
                         chess_lamp_instance.default_restore_color,
                         brightness=chess_lamp_instance.default_restore_brightness
                     )
                     if success:
-                        print(f"✅ Successfully restored to default color")
+                        log.info(f"✅ Successfully restored to default color")
                     else:
-                        print(f"⚠️  Failed to restore - lamp may still be in game color")
+                        log.warning(f"⚠️  Failed to restore - lamp may still be in game color")
             elif new_enabled_state and not was_enabled:
-                print("🔌 Chess-lamp re-enabled - will resume normal operation")
+                log.info("🔌 Chess-lamp re-enabled - will resume normal operation")
                 # If there's an active game, we'll pick up on the next monitor cycle
                 # Save current state before resuming (in case we need to restore later)
                 if chess_lamp_instance.current_game_id:
-                    print("Active game detected - saving current lamp state before resuming...")
+                    log.info("Active game detected - saving current lamp state before resuming...")
                     current_state = chess_lamp_instance.get_lamp_state()
                     if current_state:
                         chess_lamp_instance.pre_game_state = current_state
             
             status = "enabled" if new_enabled_state else "disabled"
-            print(f"🔌 Chess-lamp {status} via API")
+            log.info(f"🔌 Chess-lamp {status} via API")
             return jsonify({'success': True, 'enabled': chess_lamp_instance.enabled})
         else:
             return jsonify({'error': 'Missing "enabled" field'}), 400
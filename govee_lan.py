@@ -4,14 +4,104 @@ Govee LAN Control Module
 Attempts to control Govee devices via local network (HTTP/UDP)
 """
 
+import select
 import socket
+import sys
 import struct
 import json
+import logging
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import asyncio
+import functools
 from typing import Optional, Tuple, Dict, Any
 
+log = logging.getLogger(__name__)
+
+# Use orjson for command encoding when available (same optional dep as chess_lamp)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_command(command: Dict[str, Any]) -> bytes:
+    """Encode a LAN command as compact JSON bytes ready to send."""
+    if orjson is not None:
+        return orjson.dumps(command)
+    return json.dumps(command, separators=(',', ':')).encode('utf-8')
+
+
+# Hot commands only vary by a few integers, so they're filled into byte templates
+# instead of being built as dicts and JSON-encoded on every send
+_COLOR_TEMPLATE = b'{"msg":{"cmd":"colorwc","data":{"color":{"r":%d,"g":%d,"b":%d},"colorTemInKelvin":0}}}'
+_BRIGHTNESS_TEMPLATE = b'{"msg":{"cmd":"brightness","data":{"value":%d}}}'
+
+
+@functools.lru_cache(maxsize=64)
+def color_payload(r: int, g: int, b: int) -> bytes:
+    """Encoded colorwc command (color nested in a "color" object, as the device expects)."""
+    return _COLOR_TEMPLATE % (r, g, b)
+
+
+@functools.lru_cache(maxsize=128)
+def brightness_payload(brightness: int) -> bytes:
+    """Encoded brightness command."""
+    return _BRIGHTNESS_TEMPLATE % brightness
+
+
+# Power-on variants understood by different firmware, encoded once
+_TURN_ON_PAYLOADS = tuple(encode_command(cmd) for cmd in (
+    {"msg": {"cmd": "turn", "data": {"value": 1}}},
+    {"msg": {"cmd": "power", "data": {"value": 1}}},
+    {"cmd": "turn", "value": 1}
+))
+
+
+def _unpack_color(color: Any) -> Optional[Dict[str, int]]:
+    """Normalize a reported color - an r/g/b object or a single packed 0xRRGGBB integer."""
+    if isinstance(color, dict):
+        return {'r': color.get('r', 255), 'g': color.get('g', 255), 'b': color.get('b', 255)}
+    if isinstance(color, int):
+        return {'r': (color >> 16) & 0xFF, 'g': (color >> 8) & 0xFF, 'b': color & 0xFF}
+    return None
+
+
+def _parse_state(state_data: Any) -> Dict[str, Any]:
+    """
+    Extract color, brightness and on/off from a device state reply.
+    
+    Devices answer as {"msg": {"cmd": "devStatus", "data": {...}}}, as
+    {"data": {...}}, or with the properties at the top level.
+    
+    Args:
+        state_data: Decoded JSON reply
+        
+    Returns:
+        Dict with whichever of 'color', 'brightness' and 'onOff' were reported
+    """
+    if not isinstance(state_data, dict):
+        return {}
+    msg = state_data.get('msg')
+    if isinstance(msg, dict) and 'data' in msg:
+        data = msg['data']
+    else:
+        data = state_data.get('data', state_data)
+    if not isinstance(data, dict):
+        return {}
+    
+    state = {}
+    color = _unpack_color(data.get('color'))
+    if color is not None:
+        state['color'] = color
+    if 'brightness' in data:
+        state['brightness'] = data['brightness']
+    if 'onOff' in data or 'powerState' in data:
+        state['onOff'] = data.get('onOff') or data.get('powerState', 1)
+    return state
+
+
 # Try to use govee-local-api library if available
 try:
     from govee_local_api import GoveeController, GoveeDevice
@@ -25,6 +115,9 @@ except ImportError:
 class GoveeLANController:
     """Controller for Govee devices via local network."""
     
+    # Seconds to wait after a failed discovery before broadcasting again
+    DISCOVERY_COOLDOWN = 30.0
+    
     def __init__(self, device_mac: str, device_ip: Optional[str] = None):
         """
         Initialize LAN controller.
@@ -36,9 +129,113 @@ class GoveeLANController:
         self.device_mac = device_mac.replace(':', '').upper()
         self.device_ip = device_ip
         self.control_port = 4001  # Common Govee LAN control port
+        self._http_supported: Optional[bool] = None  # Learned from the first HTTP fallback
+        self._last_discovery_failed_at: Optional[float] = None
+        self._state_query: Optional[Tuple[int, Dict[str, Any]]] = None  # (port, command) that answered get_state
+        # One non-blocking UDP socket serves every command and port (UDP needs no
+        # per-peer setup); discovery and state queries still use their own
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        # Room for a full color burst (every payload to every port) in the send buffer
+        try:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 64 * 1024)
+        except OSError:
+            pass  # Keep the OS default
+        # Keep-alive session for devices that also take commands over HTTP
+        self._http = requests.Session()
+        self._http.headers['Content-Type'] = 'application/json'
+        self._http.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+    
+    def close(self):
+        """Close the command socket and HTTP session."""
+        self._sock.close()
+        self._http.close()
+    
+    def _recv_response(self, timeout: float, bufsize: int = 1024) -> Optional[bytes]:
+        """
+        Wait briefly for a reply on the command socket.
+        
+        Args:
+            timeout: Seconds to wait
+            bufsize: Largest datagram to accept
+            
+        Returns:
+            The datagram received, or None if nothing arrived
+        """
+        ready, _, _ = select.select([self._sock], [], [], timeout)
+        if not ready:
+            return None
+        try:
+            response, _ = self._sock.recvfrom(bufsize)
+        except OSError:
+            return None
+        return response
+    
+    def _sendto(self, data: bytes, address: Tuple[str, int]):
+        """
+        Send on the non-blocking command socket, waiting briefly if its buffer is full.
+        
+        Args:
+            data: Encoded command
+            address: (ip, port) to send to
+        """
+        try:
+            self._sock.sendto(data, address)
+        except BlockingIOError:
+            select.select([], [self._sock], [], 0.01)
+            self._sock.sendto(data, address)
+    
+    def _command_port(self) -> int:
+        """Port for color/brightness commands - the one that answered get_state, if any."""
+        if self._state_query is not None:
+            return self._state_query[0]
+        return self.control_port
+    
+    def _drain(self):
+        """Discard replies left over from earlier fire-and-forget commands."""
+        while True:
+            try:
+                self._sock.recvfrom(2048)
+            except OSError:  # BlockingIOError once the socket is empty
+                return
+    
+    def send_datagram(self, data: bytes, port: Optional[int] = None) -> bool:
+        """
+        Fire-and-forget an already-encoded command to the device.
+        
+        Args:
+            data: Encoded command (see encode_command)
+            port: Destination port (defaults to the control port)
+            
+        Returns:
+            True if the datagram was handed to the OS
+        """
+        if not self.device_ip:
+            return False
+        try:
+            self._sendto(data, (self.device_ip, port or self.control_port))
+            return True
+        except OSError as e:
+            log.warning(f"UDP send error: {e}")
+            return False
         
     def discover_device(self) -> Optional[str]:
-        """Try to discover the device IP via UDP broadcast."""
+        """
+        Try to discover the device IP via UDP broadcast.
+        A found IP is kept as device_ip; after a failure, discovery isn't
+        retried until DISCOVERY_COOLDOWN has passed.
+        """
+        if self.device_ip:
+            return self.device_ip
+        if (self._last_discovery_failed_at is not None
+                and time.monotonic() - self._last_discovery_failed_at < self.DISCOVERY_COOLDOWN):
+            return None
+        self.device_ip = self._broadcast_discovery()
+        self._last_discovery_failed_at = None if self.device_ip else time.monotonic()
+        return self.device_ip
+    
+    def _broadcast_discovery(self) -> Optional[str]:
+        """Send the discovery broadcast and return the first responder's IP."""
         try:
             # Govee devices respond to UDP discovery packets
             sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -52,15 +249,15 @@ class GoveeLANController:
             # Listen for responses
             try:
                 data, addr = sock.recvfrom(1024)
-                print(f"Discovery response from {addr[0]}: {data}")
+                log.debug("Discovery response from %s: %s", addr[0], data)
                 return addr[0]
             except socket.timeout:
-                print("No device found via UDP discovery")
+                log.warning("No device found via UDP discovery")
                 return None
             finally:
                 sock.close()
         except Exception as e:
-            print(f"Discovery error: {e}")
+            log.warning(f"Discovery error: {e}")
             return None
     
     def send_udp_command(self, command: dict, ip: Optional[str] = None) -> bool:
@@ -72,26 +269,20 @@ class GoveeLANController:
                 if not target_ip:
                     return False
             
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.settimeout(2)
-            
             # Govee LAN protocol: JSON command with specific format
-            cmd_json = json.dumps(command)
             # Some devices expect a specific header or encryption
             # Try plain JSON first
-            sock.sendto(cmd_json.encode('utf-8'), (target_ip, self.control_port))
+            self._sendto(encode_command(command), (target_ip, self.control_port))
             
-            try:
-                response, _ = sock.recvfrom(1024)
-                print(f"UDP response: {response.decode('utf-8', errors='ignore')}")
-                sock.close()
-                return True
-            except socket.timeout:
-                # Some devices don't send response, but command might still work
-                sock.close()
-                return True
+            # Some devices don't send response, but command might still work - so
+            # as in set_color, only wait for one when it would be logged
+            if log.isEnabledFor(logging.DEBUG):
+                response = self._recv_response(0.1)
+                if response is not None:
+                    log.debug("UDP response: %r", response)
+            return True
         except Exception as e:
-            print(f"UDP command error: {e}")
+            log.warning(f"UDP command error: {e}")
             return False
     
     def send_http_command(self, command: dict, ip: Optional[str] = None) -> bool:
@@ -105,20 +296,19 @@ class GoveeLANController:
             
             # Try HTTP endpoint (some Govee devices use HTTP)
             url = f"http://{target_ip}:{self.control_port}/govee"
-            headers = {'Content-Type': 'application/json'}
             
-            response = requests.put(url, json=command, headers=headers, timeout=2)
+            response = self._http.put(url, json=command, timeout=2)
             if response.status_code == 200:
-                print(f"HTTP command successful: {response.text}")
+                log.debug("HTTP command successful: %s", response.text)
                 return True
             else:
-                print(f"HTTP command failed: {response.status_code} - {response.text}")
+                log.warning(f"HTTP command failed: {response.status_code} - {response.text}")
                 return False
         except requests.exceptions.RequestException as e:
             # HTTP might not be supported, that's okay
             return False
         except Exception as e:
-            print(f"HTTP command error: {e}")
+            log.warning(f"HTTP command error: {e}")
             return False
     
     def turn_on(self, ip: Optional[str] = None) -> bool:
@@ -127,21 +317,11 @@ class GoveeLANController:
         if not target_ip:
             return False
         
-        on_commands = [
-            {"msg": {"cmd": "turn", "data": {"value": 1}}},
-            {"msg": {"cmd": "power", "data": {"value": 1}}},
-            {"cmd": "turn", "value": 1}
-        ]
-        
         for port in [4001, 4002, 4003]:
-            for cmd in on_commands:
+            for cmd_bytes in _TURN_ON_PAYLOADS:
                 try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                    sock.settimeout(0.5)
-                    sock.sendto(json.dumps(cmd).encode('utf-8'), (target_ip, port))
-                    sock.close()
-                    time.sleep(0.1)  # Small delay
-                except:
+                    self._sendto(cmd_bytes, (target_ip, port))
+                except OSError:
                     continue
         return True
     
@@ -155,107 +335,62 @@ class GoveeLANController:
         """
         target_ip = self.device_ip or self.discover_device()
         if not target_ip:
-            print("⚠️  No device IP available for LAN control")
+            log.warning("⚠️  No device IP available for LAN control")
             return False
         
         # Don't turn on - assume device is already on
         # Just set the color
         
-        # Try different ports and formats
-        ports = [4001, 4002, 4003]
-        
         # Use the CORRECT format from govee-local-api library
         # The color must be nested in a "color" object, not directly in "data"
-        commands = [
-            # Correct format: color nested in "color" object
-            {
-                "msg": {
-                    "cmd": "colorwc",
-                    "data": {
-                        "color": {
-                            "r": r,
-                            "g": g,
-                            "b": b
-                        },
-                        "colorTemInKelvin": 0
-                    }
-                }
-            }
-        ]
+        # (see color_payload)
         
-        # Don't send brightness - it might be causing issues
-        # Just send color commands and let device maintain current brightness
-        
-        # Set brightness first (if provided and > 0)
+        # Brightness and color go out back-to-back so the lamp
+        # changes both in a single step (brightness only if > 0)
+        datagrams = []
         if brightness > 0:
-            brightness_cmd = {
-                "msg": {
-                    "cmd": "brightness",
-                    "data": {"value": brightness}
-                }
-            }
-            for port in ports:
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                    sock.settimeout(0.1)  # Very fast timeout
-                    sock.sendto(json.dumps(brightness_cmd).encode('utf-8'), (target_ip, port))
-                    sock.close()
-                    break  # Just send once
-                except:
-                    continue
+            datagrams.append(brightness_payload(brightness))
+        datagrams.append(color_payload(r, g, b))
+        
+        # UDP is fire-and-forget - both go to the control port in one burst
+        port = self._command_port()
+        try:
+            for cmd_bytes in datagrams:
+                self._sendto(cmd_bytes, (target_ip, port))
+            sent = True
+        except OSError as e:
+            log.debug("UDP send to port %s failed: %s", port, e)
+            sent = False
+        
+        if sent:
+            # Govee devices rarely answer and commands work anyway - only wait for
+            # a reply when it would actually be logged
+            if log.isEnabledFor(logging.DEBUG):
+                response = self._recv_response(0.1)
+                if response is not None:
+                    log.debug("✅ UDP response: %r", response)
+            return True
         
-        # Try UDP on different ports
-        for port in ports:
-            self.control_port = port
-            for cmd in commands:
+        # Try HTTP on common ports - once none of them has answered, most devices
+        # are UDP-only, so don't spend up to 1.5s retrying on every color change
+        if self._http_supported is not False:
+            for port in [4001, 8080, 55443]:
                 try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                    sock.settimeout(0.1)  # Very fast timeout - don't wait for response
-                    
-                    if isinstance(cmd, str):
-                        # Already JSON string
-                        cmd_bytes = cmd.encode('utf-8')
-                    else:
-                        cmd_bytes = json.dumps(cmd).encode('utf-8')
-                    
-                    sock.sendto(cmd_bytes, (target_ip, port))
-                    
-                    try:
-                        response, _ = sock.recvfrom(1024)
-                        print(f"✅ UDP response on port {port}: {response.decode('utf-8', errors='ignore')}")
-                        sock.close()
-                        return True
-                    except socket.timeout:
-                        # No response, but command might still work (common for Govee devices)
-                        sock.close()
-                        # Govee devices often don't send responses, but commands still work
-                        # Return immediately - don't wait for response
+                    url = f"http://{target_ip}:{port}/govee"
+                    response = self._http.put(url, data=color_payload(r, g, b),
+                                              timeout=0.5)  # Faster HTTP timeout
+                    if response.status_code == 200:
+                        log.debug("✅ HTTP command successful on port %s", port)
+                        self._http_supported = True
                         return True
-                except Exception as e:
-                    if sock:
-                        sock.close()
+                except:
                     continue
-        
-        # Try HTTP on common ports
-        for port in [4001, 8080, 55443]:
-            try:
-                url = f"http://{target_ip}:{port}/govee"
-                for cmd in commands:
-                    if isinstance(cmd, str):
-                        continue  # Skip string commands for HTTP
-                    try:
-                        response = requests.put(url, json=cmd, timeout=0.5)  # Faster HTTP timeout
-                        if response.status_code == 200:
-                            print(f"✅ HTTP command successful on port {port}")
-                            return True
-                    except:
-                        continue
-            except:
-                continue
+            if self._http_supported is None:
+                self._http_supported = False
         
         # Even if no response, the command might have worked
         # Govee devices often don't send responses but still process commands
-        print(f"⚠️  LAN control: no response from {target_ip} (command may still have worked)")
+        log.warning(f"⚠️  LAN control: no response from {target_ip} (command may still have worked)")
         # Return True optimistically since user confirmed it's working
         return True
     
@@ -271,23 +406,11 @@ class GoveeLANController:
         if not target_ip:
             return False
         
-        ports = [4001, 4002, 4003]
-        brightness_cmd = {
-            "msg": {
-                "cmd": "brightness",
-                "data": {"value": brightness}
-            }
-        }
-        
-        for port in ports:
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                sock.settimeout(0.05)  # Very fast timeout for brightness-only
-                sock.sendto(json.dumps(brightness_cmd).encode('utf-8'), (target_ip, port))
-                sock.close()
-                return True  # Don't wait for response
-            except:
-                continue
+        # Same control port as set_color - don't wait for response
+        try:
+            self._sendto(brightness_payload(brightness), (target_ip, self._command_port()))
+        except OSError:
+            return False
         
         return True  # Optimistic - command likely worked
     
@@ -330,149 +453,71 @@ class GoveeLANController:
         # First, try using govee-local-api library if available (might have better state support)
         if GOVEE_LOCAL_API_AVAILABLE and GoveeController:
             try:
-                print("Trying govee-local-api library for state query...")
+                log.debug("Trying govee-local-api library for state query...")
                 controller = GoveeController()
                 device = GoveeDevice(mac=self.device_mac, ip=target_ip)
                 # Try to get state - the library might have a method for this
                 if hasattr(device, 'get_state') or hasattr(device, 'state'):
                     state = device.get_state() if hasattr(device, 'get_state') else device.state
                     if state:
-                        print(f"✅ Got state from govee-local-api: {state}")
+                        log.debug("✅ Got state from govee-local-api: %s", state)
                         return state
             except Exception as e:
-                print(f"⚠️  govee-local-api state query failed: {e}")
+                log.warning(f"⚠️  govee-local-api state query failed: {e}")
         
-        for port in ports:
-            for cmd in query_commands:
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                    sock.settimeout(2.0)  # Longer timeout for queries
-                    
-                    cmd_json = json.dumps(cmd)
-                    cmd_bytes = cmd_json.encode('utf-8')
-                    print(f"  Sending to {target_ip}:{port}: {cmd_json}")
-                    sock.sendto(cmd_bytes, (target_ip, port))
+        # Once a (port, command) pair has answered, only that one is asked again
+        if self._state_query is not None:
+            candidates = [self._state_query]
+        else:
+            candidates = [(port, cmd) for port in ports for cmd in query_commands]
+        
+        # Short timeout while sweeping, the usual longer one for a known pair
+        timeout = 2.0 if self._state_query else 0.3
+        # Color commands don't wait for their replies; don't mistake one for the state
+        self._drain()
+        
+        for port, cmd in candidates:
+            try:
+                cmd_bytes = encode_command(cmd)
+                log.debug("  Sending to %s:%s: %s", target_ip, port, cmd_bytes)
+                self._sendto(cmd_bytes, (target_ip, port))
+                
+                response = self._recv_response(timeout, 2048)  # Larger buffer
+                if response is not None:
+                    response_str = response.decode('utf-8', errors='ignore')
+                    log.debug("✅ Device state response on port %s with cmd %s: %s", port, cmd.get('msg', {}).get('cmd', 'unknown'), response_str)
                     
+                    # Try to parse the response
                     try:
-                        response, _ = sock.recvfrom(2048)  # Larger buffer
-                        response_str = response.decode('utf-8', errors='ignore')
-                        print(f"✅ Device state response on port {port} with cmd {cmd.get('msg', {}).get('cmd', 'unknown')}: {response_str}")
+                        state_data = json.loads(response_str)
+                        log.debug("Parsed JSON response: %s", state_data)
                         
-                        # Try to parse the response
-                        try:
-                            state_data = json.loads(response_str)
-                            print(f"Parsed JSON response: {json.dumps(state_data, indent=2)}")
-                            
-                            # Extract color, brightness, on/off from response
-                            state = {}
-                            
-                            # Check different response formats
-                            # Format 1: {"msg": {"cmd": "devStatus", "data": {...}}}
-                            if 'msg' in state_data and 'data' in state_data['msg']:
-                                data = state_data['msg']['data']
-                                if 'color' in data:
-                                    color = data['color']
-                                    if isinstance(color, dict):
-                                        state['color'] = {
-                                            'r': color.get('r', 255),
-                                            'g': color.get('g', 255),
-                                            'b': color.get('b', 255)
-                                        }
-                                    elif isinstance(color, int):
-                                        # Color might be a single integer (RGB packed)
-                                        state['color'] = {
-                                            'r': (color >> 16) & 0xFF,
-                                            'g': (color >> 8) & 0xFF,
-                                            'b': color & 0xFF
-                                        }
-                                if 'brightness' in data:
-                                    state['brightness'] = data['brightness']
-                                if 'onOff' in data or 'powerState' in data:
-                                    state['onOff'] = data.get('onOff') or data.get('powerState', 1)
-                            
-                            # Format 2: {"data": {...}}
-                            elif 'data' in state_data:
-                                data = state_data['data']
-                                if 'color' in data:
-                                    color = data['color']
-                                    if isinstance(color, dict):
-                                        state['color'] = {
-                                            'r': color.get('r', 255),
-                                            'g': color.get('g', 255),
-                                            'b': color.get('b', 255)
-                                        }
-                                    elif isinstance(color, int):
-                                        state['color'] = {
-                                            'r': (color >> 16) & 0xFF,
-                                            'g': (color >> 8) & 0xFF,
-                                            'b': color & 0xFF
-                                        }
-                                if 'brightness' in data:
-                                    state['brightness'] = data['brightness']
-                                if 'onOff' in data or 'powerState' in data:
-                                    state['onOff'] = data.get('onOff') or data.get('powerState', 1)
-                            
-                            # Format 3: Direct properties
-                            else:
-                                if 'color' in state_data:
-                                    color = state_data['color']
-                                    if isinstance(color, dict):
-                                        state['color'] = color
-                                    elif isinstance(color, int):
-                                        state['color'] = {
-                                            'r': (color >> 16) & 0xFF,
-                                            'g': (color >> 8) & 0xFF,
-                                            'b': color & 0xFF
-                                        }
-                                if 'brightness' in state_data:
-                                    state['brightness'] = state_data['brightness']
-                                if 'onOff' in state_data or 'powerState' in state_data:
-                                    state['onOff'] = state_data.get('onOff') or state_data.get('powerState', 1)
-                            
-                            if state:
-                                print(f"✅ Extracted state: {state}")
-                                sock.close()
-                                return state
-                            else:
-                                print(f"⚠️  Response received but no state data extracted")
-                        except json.JSONDecodeError as e:
-                            print(f"⚠️  Response is not JSON: {response_str[:100]}")
-                            # Maybe it's a binary response? Try to extract info anyway
-                            pass
+                        state = _parse_state(state_data)
                         
-                        sock.close()
-                    except socket.timeout:
-                        # No response - try next command
-                        sock.close()
-                        continue
-                except Exception as e:
-                    if 'sock' in locals():
-                        sock.close()
-                    continue
+                        if state:
+                            log.debug("✅ Extracted state: %s", state)
+                            self._state_query = (port, cmd)
+                            return state
+                        else:
+                            log.warning(f"⚠️  Response received but no state data extracted")
+                    except json.JSONDecodeError as e:
+                        log.warning(f"⚠️  Response is not JSON: {response_str[:100]}")
+                        # Maybe it's a binary response? Try to extract info anyway
+                        pass
+                # No response - try next command
+            except Exception as e:
+                continue
+        # The remembered pair stopped answering - sweep again next time
+        self._state_query = None
         
         # Also try HTTP query
         for port in [4001, 8080, 55443]:
             try:
                 url = f"http://{target_ip}:{port}/govee"
-                response = requests.get(url, timeout=1.0)
+                response = self._http.get(url, timeout=1.0)
                 if response.status_code == 200:
                     try:
-                        state_data = response.json()
-                        state = {}
-                        if 'data' in state_data:
-                            data = state_data['data']
-                            if 'color' in data:
-                                color = data['color']
-                                if isinstance(color, dict):
-                                    state['color'] = {
-                                        'r': color.get('r', 255),
-                                        'g': color.get('g', 255),
-                                        'b': color.get('b', 255)
-                                    }
-                            if 'brightness' in data:
-                                state['brightness'] = data['brightness']
-                            if 'onOff' in data:
-                                state['onOff'] = data['onOff']
+                        state = _parse_state(response.json())
                         if state:
                             return state
                     except:
@@ -485,8 +530,6 @@ class GoveeLANController:
 
 def test_lan_control():
     """Test function for LAN control."""
-    import sys
-    
     if len(sys.argv) < 2:
         print("Usage: python govee_lan.py <MAC_ADDRESS> [IP_ADDRESS]")
         print("Example: python govee_lan.py 5C:E7:53:34:20:4C")
@@ -515,7 +558,6 @@ def test_lan_control():
     else:
         print("❌ Failed to send command")
     
-    import time
     time.sleep(2)
     
     # Test setting color to blue